@@ -2,24 +2,28 @@ from flask import Flask, Response, render_template, request, jsonify, session, u
 from calendar_sync import (
     get_spreadsheet_data, parse_sports_events,
     create_or_get_sports_calendar, update_calendar, get_existing_events,
-    events_are_equal, list_available_sheets, calculate_changes
+    events_are_equal, get_event_match_key, list_available_sheets, calculate_changes,
+    parse_iso_datetime, list_calendar_ids,
+    SHEET_DATA_COLUMNS, SPREADSHEET_METADATA_FIELDS, SHEET_VALUES_FIELDS,
+    SHEET_GRID_DATA_FIELDS, SHEET_LIST_FIELDS, grid_data_to_values,
+    TOKEN_FILE, LEGACY_TOKEN_FILE, load_token_credentials, save_token_credentials
 )
 from googleapiclient.discovery import build
 from google.auth.exceptions import RefreshError
 import os
 import io
-from datetime import datetime
+from datetime import datetime, date
+from collections import defaultdict
 import json
 import logging
-import traceback
 import sys
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from google.auth.transport.requests import Request
 from googleapiclient.errors import HttpError
-from dateutil import parser
 from google.cloud import secretmanager
 from automated_sync import main as run_automated_sync, run_automated_sync_stream
 
@@ -99,6 +103,66 @@ SCOPES = [
     'openid'
 ]
 
+# Per-thread cache of built API clients. httplib2 connections are not
+# thread-safe, so each worker thread keeps its own clients, keyed by the
+# access token they were built with.
+_service_cache = threading.local()
+
+# Credentials loaded from the token file, reused until the file changes
+_token_file_cache = {'mtime': None, 'credentials': None}
+_token_file_lock = threading.Lock()
+
+def load_token_file():
+    """Load credentials from token.json, reusing the last load if the file is unchanged."""
+    try:
+        mtime = os.path.getmtime(TOKEN_FILE)
+    except OSError:
+        # No token.json yet; a legacy token.pickle is migrated on load
+        if not os.path.exists(LEGACY_TOKEN_FILE):
+            return None
+        mtime = None
+    with _token_file_lock:
+        if mtime is None or _token_file_cache['mtime'] != mtime:
+            _token_file_cache['credentials'] = load_token_credentials()
+            _token_file_cache['mtime'] = os.path.getmtime(TOKEN_FILE)
+        return _token_file_cache['credentials']
+
+# Single background writer so token.json writes never block a request
+# and never run concurrently with each other
+_token_write_executor = ThreadPoolExecutor(max_workers=1)
+
+def _write_token_file(creds):
+    """Write credentials to token.json and remember them as the loaded credentials."""
+    try:
+        save_token_credentials(creds)
+        with _token_file_lock:
+            _token_file_cache['credentials'] = creds
+            _token_file_cache['mtime'] = os.path.getmtime(TOKEN_FILE)
+        logger.info("Credentials saved to token.json.")
+    except Exception as e:
+        logger.error(f"Error saving credentials to token.json: {str(e)}")
+
+def capture_current_thread(handler):
+    """Limit a per-request log capture handler to records from the current thread."""
+    # gthread workers serve several requests per process, and the capture
+    # handlers are attached to shared loggers
+    thread_id = threading.get_ident()
+    handler.addFilter(lambda record: record.thread == thread_id)
+
+def get_cached_service(api, version, credentials):
+    """Build a Google API client, reusing this thread's client for the same access token."""
+    services = getattr(_service_cache, 'services', None)
+    if services is None:
+        services = _service_cache.services = {}
+    key = (api, version, credentials.token)
+    service = services.get(key)
+    if service is None:
+        # Drop clients built with an older token for the same API
+        for stale_key in [k for k in services if k[:2] == (api, version)]:
+            del services[stale_key]
+        service = services[key] = build(api, version, credentials=credentials)
+    return service
+
 def get_client_config():
     """Constructs the client configuration for OAuth, fetching secrets from Secret Manager if necessary."""
     client_id_val = os.getenv('GOOGLE_CLIENT_ID')
@@ -132,23 +196,22 @@ def get_calendar_service():
         # Check if user is authenticated via session
         if 'credentials' not in session:
             logger.info("No credentials in session.")
-            # If not in session, try to load from token.pickle
-            if os.path.exists('token.pickle'):
-                logger.info("Loading credentials from token.pickle")
-                with open('token.pickle', 'rb') as token:
-                    credentials = pickle.load(token)
-                    # Save credentials to session
-                    session['credentials'] = {
-                        'token': credentials.token,
-                        'refresh_token': credentials.refresh_token,
-                        'token_uri': credentials.token_uri,
-                        'client_id': credentials.client_id,
-                        'client_secret': credentials.client_secret,
-                        'scopes': credentials.scopes
-                    }
-                    logger.info("Credentials loaded from token.pickle and saved to session.")
+            # If not in session, try to load from token.json
+            credentials = load_token_file()
+            if credentials:
+                logger.info("Loading credentials from token.json")
+                # Save credentials to session
+                session['credentials'] = {
+                    'token': credentials.token,
+                    'refresh_token': credentials.refresh_token,
+                    'token_uri': credentials.token_uri,
+                    'client_id': credentials.client_id,
+                    'client_secret': credentials.client_secret,
+                    'scopes': credentials.scopes
+                }
+                logger.info("Credentials loaded from token.json and saved to session.")
             else:
-                logger.warning("No token.pickle file found.")
+                logger.warning("No token.json file found.")
                 raise Exception('Not authenticated with Google')
         else:
             logger.info("Credentials found in session.")
@@ -177,12 +240,11 @@ def get_calendar_service():
                 raise Exception("Your Google Calendar access token has expired. Please refresh the page to re-authenticate.")
         
         logger.info("Building calendar service...")
-        service = build('calendar', 'v3', credentials=credentials)
+        service = get_cached_service('calendar', 'v3', credentials)
         logger.info("Calendar service built successfully")
         return service
-    except Exception as e:
-        logger.error(f"Error in get_calendar_service: {str(e)}")
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("Error in get_calendar_service")
         raise
 
 def get_sheets_service():
@@ -191,23 +253,22 @@ def get_sheets_service():
         logger.info("Attempting to get Google sheets credentials...")
         if 'credentials' not in session:
             logger.info("No credentials in session for sheets.")
-            # If not in session, try to load from token.pickle
-            if os.path.exists('token.pickle'):
-                logger.info("Loading credentials from token.pickle for sheets")
-                with open('token.pickle', 'rb') as token:
-                    credentials = pickle.load(token)
-                    # Save credentials to session
-                    session['credentials'] = {
-                        'token': credentials.token,
-                        'refresh_token': credentials.refresh_token,
-                        'token_uri': credentials.token_uri,
-                        'client_id': credentials.client_id,
-                        'client_secret': credentials.client_secret,
-                        'scopes': credentials.scopes
-                    }
-                    logger.info("Credentials loaded from token.pickle and saved to session for sheets.")
+            # If not in session, try to load from token.json
+            credentials = load_token_file()
+            if credentials:
+                logger.info("Loading credentials from token.json for sheets")
+                # Save credentials to session
+                session['credentials'] = {
+                    'token': credentials.token,
+                    'refresh_token': credentials.refresh_token,
+                    'token_uri': credentials.token_uri,
+                    'client_id': credentials.client_id,
+                    'client_secret': credentials.client_secret,
+                    'scopes': credentials.scopes
+                }
+                logger.info("Credentials loaded from token.json and saved to session for sheets.")
             else:
-                logger.warning("No token.pickle file found for sheets.")
+                logger.warning("No token.json file found for sheets.")
                 raise Exception('Not authenticated with Google')
         else:
             logger.info("Credentials found in session for sheets.")
@@ -236,7 +297,7 @@ def get_sheets_service():
                 raise Exception("Your Google access token has expired. Please re-authenticate.")
         
         # Build and return the service
-        service = build('sheets', 'v4', credentials=credentials)
+        service = get_cached_service('sheets', 'v4', credentials)
         logger.info("Sheets service built successfully.")
         return service
     except Exception as e:
@@ -269,8 +330,7 @@ def index():
         resolved_spreadsheet_id = resolve_spreadsheet_id(spreadsheet_id_val)
         return render_template('index.html', spreadsheet_id=resolved_spreadsheet_id)
     except Exception as e:
-        logger.error(f"Error in index route: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in index route")
         return render_template('error.html', error_message=str(e)), 500
 
 @app.route('/auth')
@@ -299,8 +359,7 @@ def auth():
         )
         return jsonify({'success': True, 'auth_url': auth_url})
     except Exception as e:
-        logger.error(f"Error generating auth URL: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error generating auth URL")
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/auth/callback')
@@ -346,10 +405,8 @@ def auth_callback():
         }
         logger.info("Credentials saved to session.")
 
-        # Also save to token.pickle for command-line use
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-            logger.info("Credentials saved to token.pickle.")
+        # Also save to token.json for command-line use, off the request thread
+        _token_write_executor.submit(_write_token_file, creds)
 
         return """
         <html>
@@ -361,9 +418,8 @@ def auth_callback():
             </body>
         </html>
         """
-    except Exception as e:
-        logger.error(f"Error in auth callback: {str(e)}")
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("Error in auth callback")
         return """
         <html>
             <body>
@@ -381,23 +437,22 @@ def check_auth():
         logger.info("Checking authentication status...")
         
         if 'credentials' not in session:
-            logger.info("No credentials in session. Checking for token.pickle.")
-            if os.path.exists('token.pickle'):
-                logger.info("Loading credentials from token.pickle")
-                with open('token.pickle', 'rb') as token:
-                    credentials = pickle.load(token)
-                    # Save credentials to session
-                    session['credentials'] = {
-                        'token': credentials.token,
-                        'refresh_token': credentials.refresh_token,
-                        'token_uri': credentials.token_uri,
-                        'client_id': credentials.client_id,
-                        'client_secret': credentials.client_secret,
-                        'scopes': credentials.scopes
-                    }
-                    logger.info("Credentials loaded from token.pickle and saved to session.")
+            logger.info("No credentials in session. Checking for token.json.")
+            credentials = load_token_file()
+            if credentials:
+                logger.info("Loading credentials from token.json")
+                # Save credentials to session
+                session['credentials'] = {
+                    'token': credentials.token,
+                    'refresh_token': credentials.refresh_token,
+                    'token_uri': credentials.token_uri,
+                    'client_id': credentials.client_id,
+                    'client_secret': credentials.client_secret,
+                    'scopes': credentials.scopes
+                }
+                logger.info("Credentials loaded from token.json and saved to session.")
             else:
-                logger.info("No token.pickle file found.")
+                logger.info("No token.json file found.")
 
         has_google_auth = bool(session.get('credentials'))
         logger.info(f"Session credentials exist: {has_google_auth}")
@@ -408,7 +463,7 @@ def check_auth():
                 # Get user info from Google API
                 credentials = Credentials(**session['credentials'])
                 logger.info(f"Credentials scopes: {credentials.scopes}")
-                service = build('oauth2', 'v2', credentials=credentials)
+                service = get_cached_service('oauth2', 'v2', credentials)
                 user_info = service.userinfo().get().execute()
                 user_email = user_info.get('email')
                 logger.info(f"Successfully retrieved user email: {user_email}")
@@ -416,7 +471,7 @@ def check_auth():
             except Exception as e:
                 logger.warning(f"Could not get user email: {str(e)}")
                 logger.warning(f"Error type: {type(e)}")
-                logger.warning(f"Error details: {traceback.format_exc()}")
+                logger.warning("Error details", exc_info=True)
                 user_email = "Unknown User (re-authenticate to see email)"
         else:
             logger.info("No session credentials found.")
@@ -427,8 +482,7 @@ def check_auth():
             'error': None if has_google_auth else 'Missing authentication'
         })
     except Exception as e:
-        logger.error(f"Error checking auth status: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error checking auth status")
         return jsonify({'authenticated': False, 'error': str(e)})
 
 @app.route('/logout')
@@ -437,19 +491,19 @@ def logout():
         # Clear credentials from session
         session.pop('credentials', None)
         
-        # Also clear the token.pickle file if it exists
-        try:
-            if os.path.exists('token.pickle'):
-                os.remove('token.pickle')
-                logger.info("Removed token.pickle file")
-        except Exception as e:
-            logger.warning(f"Could not remove token.pickle: {str(e)}")
+        # Also clear the token files if they exist
+        for token_file in (TOKEN_FILE, LEGACY_TOKEN_FILE):
+            try:
+                if os.path.exists(token_file):
+                    os.remove(token_file)
+                    logger.info(f"Removed {token_file} file")
+            except Exception as e:
+                logger.warning(f"Could not remove {token_file}: {str(e)}")
         
         logger.info("User logged out successfully")
         return jsonify({'success': True, 'message': 'Logged out successfully'})
     except Exception as e:
-        logger.error(f"Error during logout: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error during logout")
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/load_initial_data', methods=['POST'])
@@ -471,7 +525,7 @@ def load_initial_data():
 
         sheets_service = get_sheets_service()
         try:
-            spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+            spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SPREADSHEET_METADATA_FIELDS).execute()
             spreadsheet_title = spreadsheet.get('properties', {}).get('title', 'Untitled Spreadsheet')
             spreadsheet_url = spreadsheet.get('spreadsheetUrl')
             sheets = [sheet.get('properties', {}).get('title') for sheet in spreadsheet.get('sheets', []) if not sheet.get('properties', {}).get('hidden', False)]
@@ -488,8 +542,7 @@ def load_initial_data():
             return jsonify({'success': False, 'error': f'Error accessing spreadsheet: {str(e)}'}), 500
 
     except Exception as e:
-        logger.error(f"Error in load_initial_data: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in load_initial_data")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/load_sheet', methods=['POST'])
@@ -531,6 +584,7 @@ def load_sheet():
         capture_handler = CaptureLogHandler()
         capture_handler.setLevel(logging.DEBUG)
         capture_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        capture_current_thread(capture_handler)
         
         # Add the handler to the calendar_sync logger
         from calendar_sync import logger as calendar_logger
@@ -539,39 +593,65 @@ def load_sheet():
         try:
             # Get the spreadsheet title
             sheets_service = get_sheets_service()
+            sheets_fetched_by_range = False
             try:
-                spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+                if sheet_name:
+                    # Fetch the metadata and the requested sheet's cells in one round-trip
+                    try:
+                        spreadsheet = sheets_service.spreadsheets().get(
+                            spreadsheetId=spreadsheet_id,
+                            ranges=[f'{sheet_name}!{SHEET_DATA_COLUMNS}'],
+                            includeGridData=True,
+                            fields=f'{SPREADSHEET_METADATA_FIELDS},{SHEET_GRID_DATA_FIELDS}'
+                        ).execute()
+                        sheets_fetched_by_range = True
+                    except HttpError as e:
+                        if e.resp.status != 400 or 'Unable to parse range' not in str(e):
+                            raise
+                        # The range could not be parsed, so the sheet does not exist.
+                        # Only the sheet list is needed for the error response.
+                        spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SHEET_LIST_FIELDS).execute()
+                else:
+                    spreadsheet = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SPREADSHEET_METADATA_FIELDS).execute()
                 spreadsheet_title = spreadsheet.get('properties', {}).get('title', 'Untitled Spreadsheet')
                 spreadsheet_url = spreadsheet.get('spreadsheetUrl')
+                sheets = [sheet.get('properties', {}).get('title') for sheet in spreadsheet.get('sheets', []) if not sheet.get('properties', {}).get('hidden', False)]
                 
                 # Get available sheets if no sheet name is provided
                 if not sheet_name:
-                    sheets = [sheet.get('properties', {}).get('title') for sheet in spreadsheet.get('sheets', []) if not sheet.get('properties', {}).get('hidden', False)]
                     if sheets:
                         sheet_name = sheets[0]  # Default to first visible sheet
                     else:
                         return jsonify({'success': False, 'error': 'No visible sheets found in spreadsheet'}), 400
-                else:
-                    # Verify the requested sheet exists and is not hidden
-                    sheets = [sheet.get('properties', {}).get('title') for sheet in spreadsheet.get('sheets', []) if not sheet.get('properties', {}).get('hidden', False)]
-                    if sheet_name not in sheets:
-                        return jsonify({
-                            'success': False, 
-                            'error': f'Sheet "{sheet_name}" not found or is hidden',
-                            'available_sheets': sheets
-                        }), 400
+                elif sheet_name not in sheets:
+                    # Verify the requested sheet exists and is not hidden.
+                    # A ranged fetch only returns the requested sheet, so list the rest for the error.
+                    if sheets_fetched_by_range:
+                        sheet_list = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SHEET_LIST_FIELDS).execute()
+                        sheets = [sheet.get('properties', {}).get('title') for sheet in sheet_list.get('sheets', []) if not sheet.get('properties', {}).get('hidden', False)]
+                    return jsonify({
+                        'success': False, 
+                        'error': f'Sheet "{sheet_name}" not found or is hidden',
+                        'available_sheets': sheets
+                    }), 400
             except HttpError as e:
                 if e.resp.status == 404:
                     return jsonify({'success': False, 'error': 'Spreadsheet not found'}), 404
                 return jsonify({'success': False, 'error': f'Error accessing spreadsheet: {str(e)}'}), 500
 
-            # Get the sheet data
-            range_name = f'{sheet_name}!A:Z'  # Get all columns
-            result = sheets_service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=range_name
-            ).execute()
-            values = result.get('values', [])
+            # Get the sheet data, unless it already came back with the metadata
+            requested_sheet = next((sheet for sheet in spreadsheet.get('sheets', [])
+                                    if sheet.get('properties', {}).get('title') == sheet_name and 'data' in sheet), None)
+            if requested_sheet is not None:
+                values = grid_data_to_values(requested_sheet)
+            else:
+                range_name = f'{sheet_name}!{SHEET_DATA_COLUMNS}'  # Same columns the sync reads
+                result = sheets_service.spreadsheets().values().get(
+                    spreadsheetId=spreadsheet_id,
+                    range=range_name,
+                    fields=SHEET_VALUES_FIELDS
+                ).execute()
+                values = result.get('values', [])
 
             if not values:
                 return jsonify({
@@ -609,8 +689,7 @@ def load_sheet():
                     'debug_logs': capture_handler.logs
                 })
             except Exception as e:
-                logger.error(f"Error parsing events: {str(e)}")
-                logger.error(traceback.format_exc())
+                logger.exception("Error parsing events")
                 return jsonify({
                     'success': False, 
                     'error': f'Error parsing events: {str(e)}',
@@ -635,8 +714,7 @@ def load_sheet():
 
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error in load_sheet route: {error_msg}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in load_sheet route")
         if 'invalid_grant' in error_msg or 'expired' in error_msg or 'revoked' in error_msg:
             # Clear invalid credentials from session
             session.pop('credentials', None)
@@ -661,8 +739,8 @@ def preview_changes():
 
         # Get credentials
         credentials = Credentials(**session['credentials'])
-        sheets_service = build('sheets', 'v4', credentials=credentials)
-        calendar_service = build('calendar', 'v3', credentials=credentials)
+        sheets_service = get_cached_service('sheets', 'v4', credentials)
+        calendar_service = get_cached_service('calendar', 'v3', credentials)
 
         # Get sheet data
         values = get_spreadsheet_data(sheets_service, spreadsheet_id, sheet_name)
@@ -693,27 +771,24 @@ def preview_changes():
             'to_delete': []
         }
 
+        # Index existing events so each sheet event is only compared against
+        # the existing events with the same summary and start
+        existing_by_key = defaultdict(list)
+        for existing in existing_events:
+            existing_by_key[get_event_match_key(existing)].append(existing)
+
         # Find events to add or update
+        matched_existing = set()
         for event in events:
-            found = False
-            for existing in existing_events:
-                if events_are_equal(event, existing):
-                    found = True
-                    # Note: events_are_equal already does a full comparison
-                    # so we don't need a separate compare_all parameter
-                    break
-            if not found:
+            equal_existing = [existing for existing in existing_by_key.get(get_event_match_key(event), [])
+                              if events_are_equal(event, existing)]
+            if not equal_existing:
                 changes['to_add'].append(event)
+            matched_existing.update(id(existing) for existing in equal_existing)
 
         # Find events to delete
-        for existing in existing_events:
-            found = False
-            for event in events:
-                if events_are_equal(event, existing):
-                    found = True
-                    break
-            if not found:
-                changes['to_delete'].append(existing)
+        changes['to_delete'] = [existing for existing in existing_events
+                                if id(existing) not in matched_existing]
 
         return jsonify({
             'success': True,
@@ -722,8 +797,7 @@ def preview_changes():
         })
 
     except Exception as e:
-        logger.error(f"Error in preview_changes: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in preview_changes")
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/preview_sheet_changes', methods=['POST'])
@@ -737,6 +811,7 @@ def preview_sheet_changes():
     capture_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     capture_handler.setFormatter(formatter)
+    capture_current_thread(capture_handler)
     
     # Add the handler to the root logger to capture everything
     root_logger = logging.getLogger()
@@ -757,7 +832,7 @@ def preview_sheet_changes():
 
         # Get spreadsheet title and URL
         try:
-            spreadsheet_metadata = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+            spreadsheet_metadata = sheets_service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=SPREADSHEET_METADATA_FIELDS).execute()
             spreadsheet_title = spreadsheet_metadata.get('properties', {}).get('title', 'Untitled Spreadsheet')
             spreadsheet_url = spreadsheet_metadata.get('spreadsheetUrl')
         except HttpError as e:
@@ -790,9 +865,9 @@ def preview_sheet_changes():
             for event in events:
                 start = event.get('start', {})
                 if 'dateTime' in start:
-                    dates.append(parser.isoparse(start['dateTime']).date())
+                    dates.append(parse_iso_datetime(start['dateTime']).date())
                 elif 'date' in start:
-                    dates.append(parser.isoparse(start['date']).date())
+                    dates.append(date.fromisoformat(start['date']))
             
             logger.debug(f"Dates collected for stats: {[d.isoformat() for d in dates]}")
 
@@ -841,8 +916,7 @@ def preview_sheet_changes():
         })
 
     except Exception as e:
-        logger.error(f"Error in preview_sheet_changes: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in preview_sheet_changes")
         log_contents = log_stream.getvalue()
         return jsonify({'success': False, 'error': str(e), 'logs': log_contents}), 500
     finally:
@@ -860,6 +934,7 @@ def apply_changes():
     capture_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     capture_handler.setFormatter(formatter)
+    capture_current_thread(capture_handler)
     
     # Add the handler to the root logger to capture everything
     root_logger = logging.getLogger()
@@ -912,8 +987,7 @@ def apply_changes():
         })
 
     except Exception as e:
-        logger.error(f"Error in apply_changes: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in apply_changes")
         log_contents = log_stream.getvalue()
         return jsonify({'success': False, 'error': str(e), 'logs': log_contents}), 500
     finally:
@@ -931,6 +1005,7 @@ def apply_all_sheets():
     capture_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     capture_handler.setFormatter(formatter)
+    capture_current_thread(capture_handler)
     
     # Add the handler to the root logger to capture everything
     root_logger = logging.getLogger()
@@ -968,6 +1043,13 @@ def apply_all_sheets():
         total_events_updated = 0
         total_events_deleted = 0
         
+        # Look up the existing calendars once instead of once per sheet
+        try:
+            calendar_ids = list_calendar_ids(service)
+        except Exception as e:
+            logger.warning(f"Failed to list calendars up front, looking them up per sheet: {str(e)}")
+            calendar_ids = None
+        
         # Process each sheet
         for sheet_name in available_sheets:
             logger.info(f"Processing sheet: {sheet_name}")
@@ -1003,7 +1085,7 @@ def apply_all_sheets():
                 
                 # Create or get calendar for this sheet
                 calendar_name = f"SLOHS {sheet_name}"
-                calendar_id = create_or_get_sports_calendar(service, calendar_name)
+                calendar_id = create_or_get_sports_calendar(service, calendar_name, calendar_ids=calendar_ids)
                 
                 # Update calendar with events
                 logger.info(f"Updating calendar for {sheet_name} with {len(events)} events")
@@ -1025,8 +1107,7 @@ def apply_all_sheets():
                 logger.info(f"Successfully processed {sheet_name}: {inserted} created, {changed} updated, {deleted} deleted")
                 
             except Exception as e:
-                logger.error(f"❌ Error processing sheet {sheet_name}: {str(e)}")
-                logger.error(traceback.format_exc())
+                logger.exception(f"❌ Error processing sheet {sheet_name}")
                 
                 # Provide more detailed error information
                 error_details = str(e)
@@ -1067,8 +1148,7 @@ def apply_all_sheets():
         })
         
     except Exception as e:
-        logger.error(f"Error in apply_all_sheets: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in apply_all_sheets")
         log_contents = log_stream.getvalue()
         return jsonify({
             'success': False,
@@ -1094,6 +1174,7 @@ def apply_all_to_master_calendar():
     capture_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     capture_handler.setFormatter(formatter)
+    capture_current_thread(capture_handler)
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
     root_logger.addHandler(capture_handler)
@@ -1140,8 +1221,7 @@ def apply_all_to_master_calendar():
             'debug_logs': capture_handler.logs
         })
     except Exception as e:
-        logger.error(f"Error in apply_all_to_master_calendar: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in apply_all_to_master_calendar")
         return jsonify({'success': False, 'error': str(e), 'debug_logs': capture_handler.logs}), 400
     finally:
         root_logger.removeHandler(capture_handler)
@@ -1160,6 +1240,7 @@ def preview_all_sheets():
     capture_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     capture_handler.setFormatter(formatter)
+    capture_current_thread(capture_handler)
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
     root_logger.addHandler(capture_handler)
@@ -1171,7 +1252,7 @@ def preview_all_sheets():
             return jsonify({'success': False, 'error': 'Spreadsheet ID is required'})
         logger.info("Starting preview_all_sheets route")
         credentials = Credentials(**session['credentials'])
-        sheets_service = build('sheets', 'v4', credentials=credentials)
+        sheets_service = get_cached_service('sheets', 'v4', credentials)
         # Get all available sheets
         available_sheets = list_available_sheets(sheets_service, spreadsheet_id)
         if not available_sheets:
@@ -1192,8 +1273,7 @@ def preview_all_sheets():
             'debug_logs': capture_handler.logs
         })
     except Exception as e:
-        logger.error(f"Error in preview_all_sheets: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in preview_all_sheets")
         return jsonify({'success': False, 'error': str(e), 'debug_logs': capture_handler.logs}), 400
     finally:
         root_logger.removeHandler(capture_handler)
@@ -1220,7 +1300,8 @@ def get_slohs_calendars():
                         timeMin=datetime.now().isoformat() + 'Z',
                         maxResults=1,
                         orderBy='startTime',
-                        singleEvents=True
+                        singleEvents=True,
+                        fields='items(start)'
                     ).execute()
                     
                     first_event_date = None
@@ -1251,8 +1332,7 @@ def get_slohs_calendars():
         })
         
     except Exception as e:
-        logger.error(f"Error in get_slohs_calendars: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in get_slohs_calendars")
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/get_current_calendar', methods=['POST'])
@@ -1333,8 +1413,7 @@ def get_current_calendar():
         })
         
     except Exception as e:
-        logger.error(f"Error in get_current_calendar: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in get_current_calendar")
         return jsonify({'success': False, 'error': str(e)})
 
 
@@ -1378,8 +1457,7 @@ def trigger_sync():
         logger.info("Automated sync process finished successfully.")
         return jsonify({'success': True, 'message': 'Sync triggered successfully!'})
     except Exception as e:
-        logger.error(f"Error in trigger_sync: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error in trigger_sync")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -2,13 +2,14 @@ import html
 import json
 import logging
 import os
-import pickle
 import smtplib
 import sys
-import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
 
 from dotenv import load_dotenv
 from google.auth.exceptions import RefreshError
@@ -17,8 +18,10 @@ from googleapiclient.discovery import build
 from google.cloud import secretmanager
 
 from calendar_sync import (
-    create_or_get_sports_calendar, get_spreadsheet_data, list_available_sheets,
-    parse_sports_events, update_calendar)
+    TOKEN_FILE, create_or_get_sports_calendar, get_all_spreadsheet_data,
+    get_spreadsheet_data, list_available_sheets, list_calendar_ids,
+    load_token_credentials, parse_sports_events, save_token_credentials,
+    update_calendar)
 
 # Load environment variables
 load_dotenv()
@@ -34,12 +37,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sheets synced at the same time by main(). Each worker thread builds its own
+# API clients because httplib2 connections are not thread-safe.
+SHEET_SYNC_WORKERS = 4
+
+@lru_cache(maxsize=1)
+def get_secret_client():
+    """Return a Secret Manager client shared by every secret lookup in the process."""
+    return secretmanager.SecretManagerServiceClient()
+
 def access_secret_version(secret_version_id):
     """Access the payload of the given secret version if it's a secret path."""
     if not isinstance(secret_version_id, str) or not secret_version_id.startswith('projects/'):
         return secret_version_id # Not a secret manager path, return as is
     try:
-        client = secretmanager.SecretManagerServiceClient()
+        client = get_secret_client()
         response = client.access_secret_version(name=secret_version_id)
         return response.payload.data.decode('UTF-8')
     except Exception as e:
@@ -298,18 +310,17 @@ class SyncReporter:
         return subject, html_content
 
 def get_google_credentials():
-    """Get Google credentials from token.pickle file or service account."""
+    """Get Google credentials from token.json file or service account."""
     creds = None
     
-    # First try to load from token.pickle (for OAuth2)
-    if os.path.exists('token.pickle'):
-        try:
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
-            logger.info("Loaded credentials from token.pickle")
-        except Exception as e:
-            logger.error(f"Error loading token.pickle: {e}")
-            creds = None
+    # First try to load from token.json (for OAuth2)
+    try:
+        creds = load_token_credentials()
+        if creds:
+            logger.info(f"Loaded credentials from {TOKEN_FILE}")
+    except Exception as e:
+        logger.error(f"Error loading {TOKEN_FILE}: {e}")
+        creds = None
     
     # If OAuth2 credentials are valid, use them
     if creds and creds.valid:
@@ -318,8 +329,7 @@ def get_google_credentials():
         try:
             creds.refresh(Request())
             # Save the refreshed credentials
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
+            save_token_credentials(creds)
             logger.info("Refreshed and saved credentials")
             return creds
         except RefreshError as e:
@@ -338,13 +348,15 @@ def get_google_credentials():
         logger.error(f"Error loading default service account credentials: {e}")
         return None
 
-def sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, reporter=None):
+def sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, reporter=None, values=None,
+                      calendar_ids=None):
     """Sync a single sheet and return results."""
     try:
         logger.info(f"Processing sheet: {sheet_name}")
         
-        # Get sheet data
-        values = get_spreadsheet_data(sheets_service, spreadsheet_id, sheet_name)
+        # Get sheet data, unless it was already fetched with the other sheets
+        if values is None:
+            values = get_spreadsheet_data(sheets_service, spreadsheet_id, sheet_name)
         if not values:
             return {
                 'success': False,
@@ -366,6 +378,9 @@ def sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, repor
         
         # Add the handler to the root logger to catch all parsing errors
         error_handler = ParsingErrorHandler()
+        # Ignore parsing errors logged by other threads' syncs
+        thread_id = threading.get_ident()
+        error_handler.addFilter(lambda record: record.thread == thread_id)
         root_logger = logging.getLogger()
         root_logger.addHandler(error_handler)
         
@@ -397,7 +412,7 @@ def sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, repor
         
         # Create or get calendar
         calendar_name = f"SLOHS {sheet_name}"
-        calendar_id = create_or_get_sports_calendar(service, calendar_name)
+        calendar_id = create_or_get_sports_calendar(service, calendar_name, calendar_ids=calendar_ids)
         
         # Update calendar (request detailed changes)
         deleted, inserted, changed, details = update_calendar(service, events, calendar_id, return_detailed_changes=True)
@@ -414,8 +429,7 @@ def sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, repor
         }
         
     except Exception as e:
-        logger.error(f"Error processing sheet {sheet_name}: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error processing sheet {sheet_name}")
         return {
             'success': False,
             'error': str(e),
@@ -550,11 +564,26 @@ def run_automated_sync_stream():
         yield json.dumps({"status": "error", "message": f"Failed to get available sheets: {e}"})
         return
 
+    # Fetch every sheet in one request; sheets missing from it are fetched individually
+    try:
+        sheet_values = get_all_spreadsheet_data(sheets_service, spreadsheet_id, available_sheets)
+    except Exception as e:
+        logger.warning(f"Failed to fetch all sheets at once, fetching individually: {e}")
+        sheet_values = {}
+
+    # Look up the existing calendars once instead of once per sheet
+    try:
+        calendar_ids = list_calendar_ids(service)
+    except Exception as e:
+        logger.warning(f"Failed to list calendars up front, looking them up per sheet: {e}")
+        calendar_ids = None
+
     # Process each sheet
     total_sheets = len(available_sheets)
     for i, sheet_name in enumerate(available_sheets):
         yield json.dumps({"status": "info", "message": f"Processing sheet {i+1}/{total_sheets}: {sheet_name}"})
-        result = sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name)
+        result = sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name,
+                                   values=sheet_values.get(sheet_name), calendar_ids=calendar_ids)
         yield json.dumps({"status": "sheet_result", "sheet_name": sheet_name, "result": result})
 
     yield json.dumps({"status": "complete", "message": "Sync process finished."})
@@ -605,9 +634,33 @@ def main():
         send_failure_email("Failed to get available sheets", e)
         return False
     
-    # Process each sheet
-    for sheet_name in available_sheets:
-        result = sync_single_sheet(service, sheets_service, spreadsheet_id, sheet_name, reporter)
+    # Fetch every sheet in one request; sheets missing from it are fetched individually
+    try:
+        sheet_values = get_all_spreadsheet_data(sheets_service, spreadsheet_id, available_sheets)
+    except Exception as e:
+        logger.warning(f"Failed to fetch all sheets at once, fetching individually: {e}")
+        sheet_values = {}
+
+    # Look up the existing calendars once instead of once per sheet
+    try:
+        calendar_ids = list_calendar_ids(service)
+    except Exception as e:
+        logger.warning(f"Failed to list calendars up front, looking them up per sheet: {e}")
+        calendar_ids = None
+    
+    # Process the sheets in parallel; results are still reported in sheet order
+    thread_services = threading.local()
+
+    def _sync_sheet(sheet_name):
+        if not hasattr(thread_services, 'calendar'):
+            thread_services.calendar = build('calendar', 'v3', credentials=creds)
+            thread_services.sheets = build('sheets', 'v4', credentials=creds)
+        return sync_single_sheet(thread_services.calendar, thread_services.sheets, spreadsheet_id, sheet_name,
+                                 reporter, values=sheet_values.get(sheet_name), calendar_ids=calendar_ids)
+
+    with ThreadPoolExecutor(max_workers=SHEET_SYNC_WORKERS) as executor:
+        results = list(executor.map(_sync_sheet, available_sheets))
+    for sheet_name, result in zip(available_sheets, results):
         reporter.add_sheet_result(sheet_name, result)
     
     # Generate summary
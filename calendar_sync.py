@@ -2,10 +2,12 @@ import os
 from datetime import datetime, timedelta, time as dtime, date
 from dateutil import parser
 from google.oauth2 import service_account
+from google.oauth2.credentials import Credentials
 from google.auth import default
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 import pickle
 import logging
 import argparse
@@ -15,9 +17,13 @@ import sys
 import io
 import re
 from dataclasses import dataclass
-import traceback
+from functools import lru_cache
 import pytz
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import google_auth_httplib2
+import httplib2
 
 # Load environment variables
 load_dotenv()
@@ -66,9 +72,14 @@ class ScrollingHandler(logging.Handler):
         for message in self.messages:
             tqdm.write(message)
 
-# Set up logging
+# Set up logging. LOG_LEVEL (e.g. INFO) skips the per-row and per-event debug output.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+# An unknown level would make basicConfig raise, so fall back to DEBUG instead
+INVALID_LOG_LEVEL = None
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    INVALID_LOG_LEVEL, LOG_LEVEL = LOG_LEVEL, 'DEBUG'
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),  # Log to console
@@ -76,17 +87,21 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger(__name__)
+if INVALID_LOG_LEVEL:
+    logger.warning(f"Unknown LOG_LEVEL '{INVALID_LOG_LEVEL}', using DEBUG")
 
-# Ensure the root logger also outputs to stdout for tests
-logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
-logging.getLogger().setLevel(logging.DEBUG)
+# Ensure the root logger also outputs to stdout for tests, without writing
+# every record to stdout twice when basicConfig already added a console handler
+if not any(getattr(handler, 'stream', None) is sys.stdout for handler in logging.getLogger().handlers):
+    logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
+logging.getLogger().setLevel(LOG_LEVEL)
 
 # Prevent other loggers from writing to stdout/stderr
 logging.getLogger('googleapiclient.discovery').setLevel(logging.WARNING)
 logging.getLogger('google_auth_oauthlib.flow').setLevel(logging.WARNING)
 logging.getLogger('urllib3.connectionpool').setLevel(logging.WARNING)
 
-# If modifying these scopes, delete the file token.pickle.
+# If modifying these scopes, delete the file token.json.
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets.readonly',
     'https://www.googleapis.com/auth/calendar'
@@ -95,16 +110,94 @@ SCOPES = [
 # OAuth configuration
 OAUTH_PORT = 8081
 
+# Saved OAuth user credentials. token.pickle is the old format and is only
+# read so existing installs migrate to token.json on first use.
+TOKEN_FILE = 'token.json'
+LEGACY_TOKEN_FILE = 'token.pickle'
+
 # Default values from environment variables
 DEFAULT_SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
 DEFAULT_CALENDAR_NAME = os.getenv('CALENDAR_NAME')
 DEFAULT_PROJECT_ID = os.getenv('PROJECT_ID')
 
+# Columns read from each sheet; the parser never looks past column I
+SHEET_DATA_COLUMNS = 'A:I'
+
+# Partial-response masks so the Sheets API only returns what we read
+SPREADSHEET_METADATA_FIELDS = 'properties.title,spreadsheetUrl,sheets.properties(title,hidden)'
+SHEET_LIST_FIELDS = 'sheets.properties(title,hidden)'
+SHEET_VALUES_FIELDS = 'values'
+SHEET_BATCH_VALUES_FIELDS = 'valueRanges(range,values)'
+SHEET_GRID_DATA_FIELDS = 'sheets.data.rowData.values.formattedValue'
+
+# A single M/D, M/D/YY or M/D/YYYY date, matched instead of trying strptime formats in turn
+SINGLE_DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})(?:/(\d{4}|\d{2}))?')
+
+# Any M/D[/Y] - [M/]D[/Y] range. The trailing lookahead makes '2/15-17/2025'
+# read 17 as a day rather than as the month of '17/20'.
+DATE_RANGE_PATTERN = re.compile(
+    r'(\d{1,2})/(\d{1,2})(?:/(\d{4}|\d{2}))?\s*-\s*(?:(\d{1,2})/)?(\d{1,2})(?:/(\d{4}|\d{2}))?(?![\d/])'
+)
+
+# First time in a cell such as '3:00 PM' or '2:00 dive, 3:00 swim'
+FIRST_TIME_PATTERN = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(AM|PM|am|pm)?')
+
+# Remaining date/time patterns, compiled once instead of looked up on every call
+END_YEAR_PATTERN = re.compile(r'\d{1,2}/\d{1,2}/(\d{4})')
+END_SHORT_YEAR_PATTERN = re.compile(r'\d{1,2}/\d{1,2}/(\d{2})')
+SINGLE_TIME_PATTERN = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*(AM|PM)?$')
+TWENTYFOUR_HOUR_TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+TIME_TEXT_PATTERN = re.compile(r'(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)')
+UTC_OFFSET_PATTERN = re.compile(r'[+-]\d{2}:\d{2}')
+
+# Maximum number of calls Google accepts in a single batch HTTP request
+CALENDAR_BATCH_SIZE = 50
+
+# Worker threads used when a batch request fails and calls are sent individually
+CALENDAR_FALLBACK_WORKERS = 10
+
+# Partial-response masks for events().list: the fields compared, displayed or
+# deleted by id, instead of full event bodies with creator, organizer, etc.
+EVENT_LIST_FIELDS = 'nextPageToken,items(id,summary,description,location,start,end)'
+EVENT_DELETE_LIST_FIELDS = 'nextPageToken,items(id,summary)'
+
+# Partial-response mask for calendarList().list(); calendars are matched by name
+CALENDAR_LIST_FIELDS = 'nextPageToken,items(id,summary)'
+
+# Timezone the sheet's dates and times are written in
+EVENT_TIMEZONE = 'America/Los_Angeles'
+LOCAL_TIMEZONE = pytz.timezone(EVENT_TIMEZONE)
+
+# Length given to timed events, since the sheets have no end time
+DEFAULT_EVENT_DURATION = timedelta(hours=2)
+ONE_DAY = timedelta(days=1)
+
 @dataclass
 class DateRange:
     start: date
     end: date
 
+def load_token_credentials():
+    """Load saved OAuth credentials from token.json, migrating a legacy token.pickle."""
+    if os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, 'r') as token:
+            return Credentials.from_authorized_user_info(json.load(token))
+    if os.path.exists(LEGACY_TOKEN_FILE):
+        logger.info(f"Migrating credentials from {LEGACY_TOKEN_FILE} to {TOKEN_FILE}")
+        with open(LEGACY_TOKEN_FILE, 'rb') as token:
+            creds = pickle.load(token)
+        save_token_credentials(creds)
+        return creds
+    return None
+
+def save_token_credentials(creds):
+    """Save OAuth credentials to token.json, replacing the file atomically."""
+    tmp_file = f'{TOKEN_FILE}.tmp'
+    with open(tmp_file, 'w') as token:
+        token.write(creds.to_json())
+    # Readers never see a partially written token file
+    os.replace(tmp_file, TOKEN_FILE)
+
 def get_google_credentials(auth_method='oauth'):
     """Get or refresh Google API credentials."""
     creds = None
@@ -130,19 +223,16 @@ def get_google_credentials(auth_method='oauth'):
                 creds, project = default(scopes=SCOPES)
                 logger.debug(f"Loaded default service account credentials for project: {project}")
             return creds
-        except Exception as e:
-            logger.error(f"Error with service account authentication: {str(e)}")
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error with service account authentication")
             raise
 
     # OAuth 2.0 flow
     try:
         logger.debug("Starting OAuth 2.0 credential retrieval process")
-        if os.path.exists('token.pickle'):
-            logger.debug("Found existing token.pickle file")
-            with open('token.pickle', 'rb') as token:
-                creds = pickle.load(token)
-                logger.debug("Loaded credentials from token.pickle")
+        creds = load_token_credentials()
+        if creds:
+            logger.debug(f"Loaded credentials from {TOKEN_FILE}")
 
         if not creds or not creds.valid:
             logger.debug("Credentials are invalid or missing")
@@ -151,9 +241,8 @@ def get_google_credentials(auth_method='oauth'):
                 try:
                     creds.refresh(Request())
                     logger.debug("Successfully refreshed credentials")
-                except Exception as e:
-                    logger.error(f"Failed to refresh credentials: {str(e)}")
-                    logger.error(traceback.format_exc())
+                except Exception:
+                    logger.exception("Failed to refresh credentials")
                     creds = None  # Force new OAuth flow
 
             if not creds:
@@ -196,19 +285,16 @@ def get_google_credentials(auth_method='oauth'):
                     creds = flow.credentials
                     logger.debug("Successfully obtained credentials from authorization code")
                         
-                except Exception as e:
-                    logger.error(f"Error during OAuth flow: {str(e)}")
-                    logger.error(traceback.format_exc())
+                except Exception:
+                    logger.exception("Error during OAuth flow")
                     raise
-            logger.debug("Saving credentials to token.pickle")
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
+            logger.debug(f"Saving credentials to {TOKEN_FILE}")
+            save_token_credentials(creds)
 
         logger.debug("Successfully retrieved valid credentials")
         return creds
-    except Exception as e:
-        logger.error(f"Error in get_google_credentials (OAuth): {str(e)}")
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("Error in get_google_credentials (OAuth)")
         raise
 
 def get_spreadsheet_data(service, spreadsheet_id, sheet_name):
@@ -217,20 +303,66 @@ def get_spreadsheet_data(service, spreadsheet_id, sheet_name):
         logger.debug(f"Fetching data from sheet: {sheet_name}")
         result = service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id,
-            range=f'{sheet_name}!A:I'  # Adjust range to include all relevant columns
+            range=f'{sheet_name}!{SHEET_DATA_COLUMNS}',
+            fields=SHEET_VALUES_FIELDS
         ).execute()
         return result.get('values', [])
     except Exception as e:
         logger.error(f"Error fetching spreadsheet data: {str(e)}")
         raise
 
-def parse_date(date_str):
+def get_all_spreadsheet_data(service, spreadsheet_id, sheet_names):
+    """Fetch data for several sheets in one Sheets API call, keyed by sheet name."""
+    try:
+        logger.debug(f"Fetching data from {len(sheet_names)} sheets")
+        result = service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=[f'{sheet_name}!{SHEET_DATA_COLUMNS}' for sheet_name in sheet_names],
+            fields=SHEET_BATCH_VALUES_FIELDS
+        ).execute()
+        # valueRanges come back in the same order as the requested ranges
+        return {
+            sheet_name: value_range.get('values', [])
+            for sheet_name, value_range in zip(sheet_names, result.get('valueRanges', []))
+        }
+    except Exception as e:
+        logger.error(f"Error fetching spreadsheet data: {str(e)}")
+        raise
+
+def grid_data_to_values(sheet):
+    """Convert a sheet fetched with includeGridData into the rows values().get() returns."""
+    values = []
+    for grid in sheet.get('data', []):
+        for row_data in grid.get('rowData', []):
+            row = [cell.get('formattedValue', '') for cell in row_data.get('values', [])]
+            # values().get() omits trailing empty cells and trailing empty rows
+            while row and row[-1] == '':
+                row.pop()
+            values.append(row)
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+def parse_date(date_str, default_year=None):
     """Parse a date string, handling single dates, ranges, and school-year logic for year-less dates."""
-    date_str = date_str.strip()
+    if default_year is None:
+        default_year = datetime.now().year
+    # Year-less dates depend on the current year, so it is part of the cache key
+    return _parse_date_for_year(date_str.strip(), default_year)
+
+@lru_cache(maxsize=4096)
+def _parse_date_for_year(date_str, current_year):
+    """Parse a stripped date string; cached because sheets repeat the same dates."""
     logger.debug(f"Parsing date string: '{date_str}'")
+    logger.debug(f"Current year: {current_year}")
+
+    # Reject invalid formats before any pattern matching. Every supported
+    # format has a '/', so text like 'TBD' or '1-2-2025' fails here.
+    lowered = date_str.lower()
+    if '/' not in date_str or 'week of' in lowered or ' or ' in lowered or ',' in date_str:
+        logger.debug(f"Rejecting date with invalid keywords or format: '{date_str}'")
+        raise ValueError(f"Invalid date format: {date_str}")
 
-    today = datetime.now()
-    logger.debug(f"Current today.year: {today.year}")
     crossover_month = 8  # August is the typical start of a school year
 
     def _infer_year(month, default_year):
@@ -243,76 +375,71 @@ def parse_date(date_str):
         logger.debug(f"Calculated year: {calculated_year}")
         return calculated_year
 
+    def _expand_year(year_str):
+        """Convert a 2- or 4-digit year, using the same century pivot as strptime's %y."""
+        year = int(year_str)
+        if len(year_str) == 2:
+            year += 2000 if year < 69 else 1900
+        return year
+
     def _parse_single_date(single_date_str, context_year=None):
         """Parses a single date string, inferring year if missing."""
-        # Try MM/DD/YYYY
-        try:
-            return datetime.strptime(single_date_str, "%m/%d/%Y").date()
-        except ValueError:
-            pass
-
-        # Try MM/DD/YY
-        try:
-            return datetime.strptime(single_date_str, "%m/%d/%y").date()
-        except ValueError:
-            pass
-
-        # Try MM/DD (no year)
-        try:
-            d_no_year = datetime.strptime(single_date_str, "%m/%d")
+        # MM/DD/YYYY, MM/DD/YY or MM/DD (no year)
+        single_date_match = SINGLE_DATE_PATTERN.fullmatch(single_date_str)
+        if not single_date_match:
+            raise ValueError(f"Invalid date format: {single_date_str}")
+        month_str, day_str, year_str = single_date_match.groups()
+        month, day = int(month_str), int(day_str)
+        if year_str is None:
             if context_year:
                 year_to_use = context_year
             else:
-                year_to_use = _infer_year(d_no_year.month, default_year=today.year)
-            return date(year_to_use, d_no_year.month, d_no_year.day)
+                year_to_use = _infer_year(month, default_year=current_year)
+        else:
+            year_to_use = _expand_year(year_str)
+        try:
+            return date(year_to_use, month, day)
         except ValueError:
             raise ValueError(f"Invalid date format: {single_date_str}")
 
-    # Reject invalid formats
-    if 'week of' in date_str.lower() or ' or ' in date_str.lower() or ',' in date_str:
-        logger.debug(f"Rejecting date with invalid keywords or format: '{date_str}'")
-        raise ValueError(f"Invalid date format: {date_str}")
-
-    # Specific range formats first
-    # Full range: 8/4/2025 - 8/7/2025 (MM/DD/YYYY - MM/DD/YYYY)
-    full_range_match = re.match(r'(\d{1,2}/\d{1,2}/\d{4})\s*-\s*(\d{1,2}/\d{1,2}/\d{4})', date_str)
-    if full_range_match:
-        start_str, end_str = full_range_match.groups()
-        start_date = _parse_single_date(start_str)
-        end_date = _parse_single_date(end_str)
-        logger.debug(f"Parsed full date range: {start_date} to {end_date}")
-        return start_date, end_date
-
-    # Shorthand range with year: 2/15-17/2025 (MM/DD-DD/YYYY)
-    range_with_year_match = re.match(r'(\d{1,2})/(\d{1,2})\s*-\s*(\d{1,2})/(\d{4})', date_str)
-    if range_with_year_match:
-        month, start_day, end_day, year = map(int, range_with_year_match.groups())
-        start_date = date(year, month, start_day)
-        end_date = date(year, month, end_day)
-        logger.debug(f"Parsed shorthand range with year: {start_date} to {end_date}")
-        return start_date, end_date
-
-    # Shorthand range, different month, no year: 8/4 - 8/7 (MM/DD - MM/DD)
-    range_no_year_diff_month_match = re.match(r'(\d{1,2})/(\d{1,2})\s*-\s*(\d{1,2})/(\d{1,2})', date_str)
-    if range_no_year_diff_month_match:
-        start_month, start_day, end_month, end_day = map(int, range_no_year_diff_month_match.groups())
-        range_year = _infer_year(start_month, default_year=today.year)
-        start_date = date(range_year, start_month, start_day)
-        end_date = date(range_year, end_month, end_day)
-        if end_month < start_month:
-            end_date = date(range_year + 1, end_month, end_day)
-        logger.debug(f"Parsed range with different months, no year: {start_date} to {end_date}")
-        return start_date, end_date
-
-    # Shorthand range, same month, no year: 9/5-6 (MM/DD-DD)
-    range_no_year_same_month_match = re.match(r'(\d{1,2})/(\d{1,2})-(\d{1,2})', date_str)
-    if range_no_year_same_month_match:
-        month, start_day, end_day = map(int, range_no_year_same_month_match.groups())
-        year = _infer_year(month, default_year=today.year)
-        start_date = date(year, month, start_day)
-        end_date = date(year, month, end_day)
-        logger.debug(f"Parsed range with same month, no year: {start_date} to {end_date}")
-        return start_date, end_date
+    # Specific range formats first, all matched by one pattern:
+    # 8/4/2025 - 8/7/2025, 2/15-17/2025, 7/28-8/1/2025, 8/4 - 8/7 and 9/5-6.
+    # Most cells are single dates, which skip the range pattern entirely.
+    range_match = DATE_RANGE_PATTERN.match(date_str) if '-' in date_str else None
+    if range_match:
+        start_month, start_day, start_year, end_month, end_day, end_year = range_match.groups()
+        # A bare end day is only a range when written tightly, as in '9/5-6'
+        if not end_month and not end_year and any(c.isspace() for c in range_match.group(0)):
+            raise ValueError(f"Invalid date range: {date_str}")
+        start_month, start_day, end_day = int(start_month), int(start_day), int(end_day)
+        end_month = int(end_month) if end_month else start_month
+        if start_year and end_year:
+            start_date = date(_expand_year(start_year), start_month, start_day)
+            end_date = date(_expand_year(end_year), end_month, end_day)
+            if end_date < start_date:
+                raise ValueError(f"Invalid date range: {date_str}")
+            logger.debug(f"Parsed full date range: {start_date} to {end_date}")
+            return start_date, end_date
+        if end_year:
+            # Only the end has a year; the start is in the previous year if its month is later
+            year = _expand_year(end_year)
+            start_date = date(year - 1 if start_month > end_month else year, start_month, start_day)
+            end_date = date(year, end_month, end_day)
+            if end_date < start_date:
+                raise ValueError(f"Invalid date range: {date_str}")
+            logger.debug(f"Parsed range with year: {start_date} to {end_date}")
+            return start_date, end_date
+        if not start_year:
+            range_year = _infer_year(start_month, default_year=current_year)
+            start_date = date(range_year, start_month, start_day)
+            end_date = date(range_year, end_month, end_day)
+            if end_month < start_month:
+                end_date = date(range_year + 1, end_month, end_day)
+            elif end_date < start_date:
+                raise ValueError(f"Invalid date range: {date_str}")
+            logger.debug(f"Parsed range, no year: {start_date} to {end_date}")
+            return start_date, end_date
+        # Only the start has a year; left to the generic range handling below
 
     # Generic range (e.g., "7/28-8/1/2025" where only end has year, or "7/28-8/1")
     # This should be the last resort for ranges
@@ -323,11 +450,11 @@ def parse_date(date_str):
 
         explicit_year = None
         # Try to find an explicit year in the end_part_str first
-        year_match = re.search(r'\d{1,2}/\d{1,2}/(\d{4})', end_part_str)
+        year_match = END_YEAR_PATTERN.search(end_part_str)
         if year_match:
             explicit_year = int(year_match.group(1))
         else:
-            year_match_short = re.search(r'\d{1,2}/\d{1,2}/(\d{2})', end_part_str)
+            year_match_short = END_SHORT_YEAR_PATTERN.search(end_part_str)
             if year_match_short:
                 two_digit_year = int(year_match_short.group(1))
                 explicit_year = 2000 + two_digit_year if two_digit_year < 50 else 1900 + two_digit_year
@@ -358,7 +485,7 @@ def parse_single_time(time_str):
     if time_str.lower() in ('tbd', 'all day') or looks_like_location(time_str):
         return None
     # Handle '3 PM', '3:00 PM', '15:00', etc.
-    pm_match = re.match(r'^(\d{1,2})(?::(\d{2}))?\s*(AM|PM)?$', time_str)
+    pm_match = SINGLE_TIME_PATTERN.match(time_str)
     if pm_match:
         hours = int(pm_match.group(1))
         minutes = int(pm_match.group(2)) if pm_match.group(2) else 0
@@ -369,7 +496,7 @@ def parse_single_time(time_str):
             hours = 0
         return dtime(hours, minutes)
     # Handle 24-hour time
-    twentyfour_match = re.match(r'^(\d{1,2}):(\d{2})$', time_str)
+    twentyfour_match = TWENTYFOUR_HOUR_TIME_PATTERN.match(time_str)
     if twentyfour_match:
         hours = int(twentyfour_match.group(1))
         minutes = int(twentyfour_match.group(2))
@@ -393,7 +520,7 @@ def parse_time(time_str, date):
         # For all-day events, start at midnight
         return datetime.combine(date, dtime(0, 0, 0))
     # Extract first time if multiple times are present
-    first_time_match = re.search(r'(\d{1,2}(?::\d{2})?\s*(?:AM|PM)?)', time_str)
+    first_time_match = TIME_TEXT_PATTERN.search(time_str)
     if first_time_match:
         time_str = first_time_match.group(1)
     time_obj = parse_single_time(time_str)
@@ -401,16 +528,17 @@ def parse_time(time_str, date):
         return datetime.combine(date, dtime(0, 0, 0))
     return datetime.combine(date, time_obj)
 
+@lru_cache(maxsize=1024)
 def extract_first_time(time_str):
     """Extract the first valid time from a string like '2:00 dive, 3:00 swim'."""
     if not time_str:
         logger.debug("No time string provided")
         return None
-    # Find all time-like patterns
-    matches = re.findall(r'(\d{1,2})(?::(\d{2}))?\s*(AM|PM|am|pm)?', time_str)
-    logger.debug(f"Time string '{time_str}' - found {len(matches)} time matches: {matches}")
-    if matches:
-        hour, minute, ampm = matches[0]
+    # Only the first time-like pattern is used, so stop scanning there
+    match = FIRST_TIME_PATTERN.search(time_str)
+    logger.debug(f"Time string '{time_str}' - first time match: {match.groups() if match else None}")
+    if match:
+        hour, minute, ampm = match.groups()
         hour = int(hour)
         minute = int(minute) if minute else 0
         if ampm and ampm.lower() == 'pm' and hour < 12:
@@ -429,11 +557,13 @@ def extract_first_time(time_str):
     logger.debug(f"No valid time found in '{time_str}'")
     return None
 
+def has_cell_value(value):
+    """Check if a cell holds something other than whitespace or the '--' placeholder."""
+    # Strip once instead of once per comparison
+    return bool(value) and value.strip() not in ('', '--')
+
 def parse_sports_events(data, sheet_name=None):
     """Parse sports events from list data."""
-    tz_str = 'America/Los_Angeles'
-    local_tz = pytz.timezone(tz_str)
-
     if not data or len(data) < 2:  # Need at least headers and one event
         logger.warning(f"Not enough data rows: {len(data) if data else 0}")
         return []
@@ -533,20 +663,26 @@ def parse_sports_events(data, sheet_name=None):
 
     events = []
     data_start_row = header_row_idx + 1
+    # Rows shorter than this cannot hold the required fields
+    required_max = max(date_idx, event_idx, location_idx)
+    # Year used for dates without one, looked up once for the whole sheet
+    current_year = datetime.now().year
     logger.debug(f"Processing {len(data[data_start_row:])} data rows starting from row {data_start_row}")
     for i, row in enumerate(data[data_start_row:]):
-        logger.info(f"Processing raw row {i+data_start_row+1}: {row}")
+        # Skip blank and short rows before doing any per-row work
+        if len(row) < required_max + 1:
+            logger.debug(f"Row {i+data_start_row+1} too short: {len(row)} columns, need at least {required_max + 1}")
+            continue
+        logger.debug(f"Processing raw row {i+data_start_row+1}: {row}")
         try:
-            # Check if we have enough columns for required fields
-            required_max = max(date_idx, event_idx, location_idx)
-            if len(row) < required_max + 1:
-                logger.debug(f"Row {i+data_start_row+1} too short: {len(row)} columns, need at least {required_max + 1}")
-                continue
-                
             date_str = row[date_idx]
             event = row[event_idx]
             location = row[location_idx]
             
+            if not date_str or not event or not location:
+                logger.debug(f"Row {i+data_start_row+1} missing required data - skipping")
+                continue
+            
             if time_idx is not None:
                 logger.debug(f"Accessing row[{time_idx}] for time. Row length is {len(row)}.")
                 time_from_row = row[time_idx] if len(row) > time_idx else "INDEX OUT OF BOUNDS"
@@ -574,32 +710,21 @@ def parse_sports_events(data, sheet_name=None):
             logger.debug(f"Row {i+data_start_row+1}: Date='{date_str}', Event='{event}', Location='{location}', Time='{time_str}'")
             logger.debug(f"Additional fields: Transportation='{transportation}', Release='{release_time}', Departure='{departure_time}', Attire='{attire}', Notes='{notes}', Bus='{bus}', Vans='{vans}'")
             
-            if not date_str or not event or not location:
-                logger.debug(f"Row {i+data_start_row+1} missing required data - skipping")
-                continue
             try:
-                start_date, end_date = parse_date(date_str)
+                start_date, end_date = parse_date(date_str, default_year=current_year)
                 logger.debug(f"Passing this time string to extract_first_time: '{time_str}'")
                 parsed_time = extract_first_time(time_str)
 
                 # Build description with all available information
                 description_parts = [f"Location: {location}"]
                 
-                # Add the original time string to the description if it exists and is not a placeholder
-                if time_str and time_str.strip() and time_str.strip() != '--':
-                    description_parts.append(f"Time: {time_str}")
-                
-                # Add other fields to description if they have values and are not placeholders
-                if transportation and transportation.strip() and transportation.strip() != '--':
-                    description_parts.append(f"Transportation: {transportation}")
-                if release_time and release_time.strip() and release_time.strip() != '--':
-                    description_parts.append(f"Release Time: {release_time}")
-                if departure_time and departure_time.strip() and departure_time.strip() != '--':
-                    description_parts.append(f"Departure Time: {departure_time}")
-                if attire and attire.strip() and attire.strip() != '--':
-                    description_parts.append(f"Attire: {attire}")
-                if notes and notes.strip() and notes.strip() != '--':
-                    description_parts.append(f"Notes: {notes}")
+                # Add the original time string and the other fields to the
+                # description if they have values and are not placeholders
+                for label, value in (('Time', time_str), ('Transportation', transportation),
+                                     ('Release Time', release_time), ('Departure Time', departure_time),
+                                     ('Attire', attire), ('Notes', notes)):
+                    if has_cell_value(value):
+                        description_parts.append(f"{label}: {value}")
                 
                 description = "\n".join(description_parts)
                 
@@ -612,19 +737,19 @@ def parse_sports_events(data, sheet_name=None):
                 if parsed_time:
                     # This is a timed event
                     start_datetime_naive = datetime.combine(start_date, parsed_time)
-                    start_datetime_aware = local_tz.localize(start_datetime_naive)
+                    start_datetime_aware = LOCAL_TIMEZONE.localize(start_datetime_naive)
                     # Assume a 2-hour duration if no end time is specified
-                    end_datetime_aware = start_datetime_aware + timedelta(hours=2)
-                    event_dict["start"] = {"dateTime": start_datetime_aware.isoformat(), "timeZone": tz_str}
-                    event_dict["end"] = {"dateTime": end_datetime_aware.isoformat(), "timeZone": tz_str}
+                    end_datetime_aware = start_datetime_aware + DEFAULT_EVENT_DURATION
+                    event_dict["start"] = {"dateTime": start_datetime_aware.isoformat(), "timeZone": EVENT_TIMEZONE}
+                    event_dict["end"] = {"dateTime": end_datetime_aware.isoformat(), "timeZone": EVENT_TIMEZONE}
                 else:
                     # This is an all-day event
                     if end_date:
                         # Multi-day all-day event
-                        end_date_for_calendar = end_date + timedelta(days=1)
+                        end_date_for_calendar = end_date + ONE_DAY
                     else:
                         # Single all-day event
-                        end_date_for_calendar = start_date + timedelta(days=1)
+                        end_date_for_calendar = start_date + ONE_DAY
                     event_dict["start"] = {"date": start_date.strftime("%Y-%m-%d")}
                     event_dict["end"] = {"date": end_date_for_calendar.strftime("%Y-%m-%d")}
                 
@@ -650,7 +775,10 @@ def list_available_sheets(service, spreadsheet_id):
     """List all available sheets in the spreadsheet, ignoring hidden ones."""
     try:
         logger.debug("Fetching available sheets")
-        spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+        spreadsheet = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields=SPREADSHEET_METADATA_FIELDS
+        ).execute()
         all_sheets = spreadsheet.get('sheets', [])
         
         
@@ -672,15 +800,36 @@ def list_available_sheets(service, spreadsheet_id):
         logger.error(f"Error listing sheets: {str(e)}")
         raise
 
-def create_or_get_sports_calendar(service, calendar_name, description=None):
-    """Create a new calendar if it doesn't exist, or get the existing one."""
+def list_calendar_ids(service):
+    """Return a {summary: id} map of every calendar in the user's calendar list."""
+    calendar_ids = {}
+    page_token = None
+    while True:
+        calendar_list = service.calendarList().list(
+            pageToken=page_token,
+            fields=CALENDAR_LIST_FIELDS
+        ).execute()
+        for calendar in calendar_list.get('items', []):
+            # Keep the first match, as the old linear scan did
+            calendar_ids.setdefault(calendar['summary'], calendar['id'])
+        page_token = calendar_list.get('nextPageToken')
+        if not page_token:
+            return calendar_ids
+
+def create_or_get_sports_calendar(service, calendar_name, description=None, calendar_ids=None):
+    """Create a new calendar if it doesn't exist, or get the existing one.
+
+    Callers handling several sheets can pass the map from list_calendar_ids
+    so the calendar list is fetched once; new calendars are added to it.
+    """
     try:
         logger.debug(f"Checking for existing calendar: {calendar_name}")
-        calendar_list = service.calendarList().list().execute()
-        for calendar in calendar_list.get('items', []):
-            if calendar['summary'] == calendar_name:
-                logger.info(f"Found existing calendar: {calendar_name}")
-                return calendar['id']
+        if calendar_ids is None:
+            calendar_ids = list_calendar_ids(service)
+        calendar_id = calendar_ids.get(calendar_name)
+        if calendar_id:
+            logger.info(f"Found existing calendar: {calendar_name}")
+            return calendar_id
         
         logger.info(f"Creating new calendar: {calendar_name}")
         calendar = {
@@ -690,6 +839,7 @@ def create_or_get_sports_calendar(service, calendar_name, description=None):
         }
         created_calendar = service.calendars().insert(body=calendar).execute()
         calendar_id = created_calendar['id']
+        calendar_ids[calendar_name] = calendar_id
         logger.info(f"Created new calendar with ID: {calendar_id}")
         
         # Make the calendar world-readable by setting ACL
@@ -868,7 +1018,8 @@ def delete_all_events(service, calendar_id):
             events_result = service.events().list(
                 calendarId=calendar_id,
                 pageToken=page_token,
-                maxResults=2500  # Maximum allowed by API
+                maxResults=2500,  # Maximum allowed by API
+                fields=EVENT_DELETE_LIST_FIELDS
             ).execute()
             
             page_events = events_result.get('items', [])
@@ -878,13 +1029,16 @@ def delete_all_events(service, calendar_id):
             if not page_token:
                 break
                 
-        # Delete each event
+        # Delete the events, up to CALENDAR_BATCH_SIZE per HTTP request
         total_events = len(events)
         logger.info(f"Found {total_events} events to delete")
         
-        for event in events:
-            logger.info(f"Deleting event: {event.get('summary', 'No title')}")
-            service.events().delete(calendarId=calendar_id, eventId=event['id']).execute()
+        failures = execute_batched(service, [
+            (event.get('summary', 'No title'), service.events().delete(calendarId=calendar_id, eventId=event['id']))
+            for event in events
+        ], 'deleting')
+        if failures:
+            raise Exception(f"Failed to delete {failures} of {total_events} events")
             
         logger.info("Successfully deleted all events from calendar")
     except Exception as e:
@@ -982,6 +1136,17 @@ def fix_event_times(event):
         return False, f"Error fixing times: {str(e)}"
 
 
+# Each calendar dateTime is parsed for its key, its match key and every comparison,
+# and the same strings come back on every sync
+@lru_cache(maxsize=8192)
+def parse_iso_datetime(value):
+    """Parse an ISO 8601 dateTime from the sheet parser or the Calendar API."""
+    try:
+        # C-implemented, and handles every form the Calendar API returns
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parser.isoparse(value)
+
 def get_event_key(event):
     """Generate a unique key for an event based on its start date and summary."""
     start = event.get('start', {})
@@ -991,23 +1156,35 @@ def get_event_key(event):
 
     # Get start date
     if 'dateTime' in start:
-        dt = parser.isoparse(start['dateTime'])
+        dt = parse_iso_datetime(start['dateTime'])
         start_date_str = dt.date().isoformat() # Use local date, not UTC
     elif 'date' in start:
         start_date_str = start['date']
     else:
-        logger.debug(f"Could not determine start date for event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Could not determine start date for event: {json.dumps(event)}")
         return None
         
-    key = f"{start_date_str}_{summary}"
-    logger.debug(f"Generated key: '{key}' for event: '{summary}'")
+    key = (start_date_str, summary)
+    logger.debug(f"Generated key: {key} for event: '{summary}'")
     return key
 
+def get_event_match_key(event):
+    """Key that two events must share for events_are_equal to consider them equal."""
+    start = event.get('start', {})
+    summary = (event.get('summary', '') or '').strip()
+    if 'dateTime' in start:
+        # Compare instants, not local dates, like events_are_equal does
+        return summary, parse_iso_datetime(start['dateTime']).astimezone(pytz.utc)
+    return summary, start.get('date')
+
 def events_are_equal(event1, event2):
     """Compare two events for equality, ignoring timezone differences and handling missing fields."""
-    logger.debug("--- Comparing Events ---")
-    logger.debug(f"Event 1 (Sheet): {json.dumps(event1, indent=2)}")
-    logger.debug(f"Event 2 (Calendar): {json.dumps(event2, indent=2)}")
+    # Pretty-printing both events is costly, so only do it when it will be logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("--- Comparing Events ---")
+        logger.debug(f"Event 1 (Sheet): {json.dumps(event1, indent=2)}")
+        logger.debug(f"Event 2 (Calendar): {json.dumps(event2, indent=2)}")
 
     # Compare summaries (ignoring whitespace)
     summary1 = (event1.get('summary', '') or '').strip()
@@ -1016,13 +1193,29 @@ def events_are_equal(event1, event2):
         logger.debug(f"Summaries do not match: '{summary1}' vs '{summary2}'")
         return False
         
+    # Compare descriptions (ignoring whitespace and timezone info)
+    # Handle None descriptions as empty strings
+    desc1 = (event1.get('description') or '').strip()
+    desc2 = (event2.get('description') or '').strip()
+    
+    logger.debug(f"Description 1 repr: {repr(desc1)}")
+    logger.debug(f"Description 2 repr: {repr(desc2)}")
+    
+    # Clean up descriptions by removing timezone info and whitespace
+    desc1 = UTC_OFFSET_PATTERN.sub('', desc1).strip()
+    desc2 = UTC_OFFSET_PATTERN.sub('', desc2).strip()
+    
+    if desc1 != desc2:
+        logger.debug(f"Descriptions do not match: '{desc1}' vs '{desc2}'")
+        return False
+
     # Compare start times
     start1 = event1.get('start', {})
     start2 = event2.get('start', {})
     
     if ('dateTime' in start1 and 'dateTime' in start2):
-        dt1 = parser.isoparse(start1['dateTime'])
-        dt2 = parser.isoparse(start2['dateTime'])
+        dt1 = parse_iso_datetime(start1['dateTime'])
+        dt2 = parse_iso_datetime(start2['dateTime'])
         if dt1.astimezone(pytz.utc) != dt2.astimezone(pytz.utc):
             logger.debug(f"Start dateTimes do not match: '{start1['dateTime']}' vs '{start2['dateTime']}'")
             return False
@@ -1040,8 +1233,8 @@ def events_are_equal(event1, event2):
     end2 = event2.get('end', {})
     
     if ('dateTime' in end1 and 'dateTime' in end2):
-        dt1 = parser.isoparse(end1['dateTime'])
-        dt2 = parser.isoparse(end2['dateTime'])
+        dt1 = parse_iso_datetime(end1['dateTime'])
+        dt2 = parse_iso_datetime(end2['dateTime'])
         if dt1.astimezone(pytz.utc) != dt2.astimezone(pytz.utc):
             logger.debug(f"End dateTimes do not match: '{end1['dateTime']}' vs '{end2['dateTime']}'")
             return False
@@ -1054,22 +1247,6 @@ def events_are_equal(event1, event2):
         logger.debug("Mismatch: One event end is timed, the other is all-day.")
         return False
         
-    # Compare descriptions (ignoring whitespace and timezone info)
-    # Handle None descriptions as empty strings
-    desc1 = (event1.get('description') or '').strip()
-    desc2 = (event2.get('description') or '').strip()
-    
-    logger.debug(f"Description 1 repr: {repr(desc1)}")
-    logger.debug(f"Description 2 repr: {repr(desc2)}")
-    
-    # Clean up descriptions by removing timezone info and whitespace
-    desc1 = re.sub(r'[+-]\d{2}:\d{2}', '', desc1).strip()
-    desc2 = re.sub(r'[+-]\d{2}:\d{2}', '', desc2).strip()
-    
-    if desc1 != desc2:
-        logger.debug(f"Descriptions do not match: '{desc1}' vs '{desc2}'")
-        return False
-
     logger.debug("Events are equal.")
     return True
 
@@ -1083,14 +1260,15 @@ def get_existing_events(service, calendar_id):
             events_result = service.events().list(
                 calendarId=calendar_id,
                 pageToken=page_token,
-                maxResults=2500
+                maxResults=2500,
+                fields=EVENT_LIST_FIELDS
             ).execute()
             
             for event in events_result.get('items', []):
                 key = get_event_key(event)
                 if key:
                     events[key] = event
-                    logger.debug(f"Fetched calendar event key: '{key}' for event: '{event.get('summary', 'Unknown')}'")
+                    logger.debug(f"Fetched calendar event key: {key} for event: '{event.get('summary', 'Unknown')}'")
             
             page_token = events_result.get('nextPageToken')
             if not page_token:
@@ -1110,7 +1288,6 @@ def calculate_changes(events, existing_events_dict):
     events_to_keep = set()
     inserted_events = []
     updated_pairs = []
-    deleted_events = []
 
     for event in events:
         try:
@@ -1135,11 +1312,9 @@ def calculate_changes(events, existing_events_dict):
             logger.error(f"Error processing event '{event.get('summary', 'Unknown')}': {e}")
             continue
 
-    existing_keys = set(existing_events_dict.keys())
-    keys_to_delete = existing_keys - events_to_keep
-    
-    for key in keys_to_delete:
-        deleted_events.append(existing_events_dict[key])
+    # One pass over the calendar events, keeping their order for the delete batches
+    deleted_events = [existing_event for key, existing_event in existing_events_dict.items()
+                      if key not in events_to_keep]
 
     return {
         'inserted': inserted_events,
@@ -1147,6 +1322,84 @@ def calculate_changes(events, existing_events_dict):
         'deleted': deleted_events
     }
 
+def execute_batched(service, requests, action):
+    """Execute (summary, request) pairs through the Calendar batch endpoint.
+
+    Requests are sent in chunks of CALENDAR_BATCH_SIZE, so N calls cost
+    N / 50 HTTP round-trips instead of N. Failures are logged per request
+    and do not abort the rest of the batch. If the batch itself is rejected
+    with an HttpError, only the requests that never got a response are sent
+    again individually. Any other error (a timeout or dropped connection)
+    may come after the server applied the changes, so those requests are
+    counted as failures instead of being sent twice. Returns the number of
+    failures.
+    """
+    failures = 0
+    for chunk_start in range(0, len(requests), CALENDAR_BATCH_SIZE):
+        chunk = requests[chunk_start:chunk_start + CALENDAR_BATCH_SIZE]
+        answered = set()
+
+        def _callback(request_id, response, exception, chunk=chunk, answered=answered):
+            nonlocal failures
+            answered.add(int(request_id))
+            if exception is not None:
+                failures += 1
+                logger.error(f"Error {action} event {chunk[int(request_id)][0]}: {exception}")
+
+        batch = service.new_batch_http_request(callback=_callback)
+        for i, (summary, request) in enumerate(chunk):
+            logger.debug(f"{action.capitalize()} event: {summary}")
+            batch.add(request, request_id=str(i))
+        try:
+            batch.execute()
+        except Exception as e:
+            pending = [pair for i, pair in enumerate(chunk) if i not in answered]
+            if not pending:
+                logger.warning(f"Batch request failed while {action} events after every response arrived: {e}")
+            elif isinstance(e, HttpError):
+                logger.warning(f"Batch request rejected while {action} {len(pending)} events, sending them individually: {e}")
+                failures += execute_concurrently(pending, action)
+            else:
+                failures += len(pending)
+                logger.error(f"Batch request failed while {action} {len(pending)} events; not resending since they may already be applied: {e}")
+    return failures
+
+def execute_concurrently(requests, action):
+    """Execute (summary, request) pairs individually on a thread pool.
+
+    httplib2 connections are not thread-safe, so each worker thread gets its
+    own authorized Http built from the request's credentials. If the
+    credentials cannot be recovered the requests are run sequentially.
+    Returns the number of failures.
+    """
+    if not requests:
+        return 0
+
+    credentials = getattr(requests[0][1].http, 'credentials', None)
+    thread_state = threading.local()
+
+    def _execute(request):
+        if credentials is None:
+            return request.execute()
+        if not hasattr(thread_state, 'http'):
+            thread_state.http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        return request.execute(http=thread_state.http)
+
+    failures = 0
+    max_workers = CALENDAR_FALLBACK_WORKERS if credentials is not None else 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for summary, request in requests:
+            logger.debug(f"{action.capitalize()} event: {summary}")
+            futures[executor.submit(_execute, request)] = summary
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                logger.error(f"Error {action} event {futures[future]}: {e}")
+    return failures
+
 def update_calendar(service, events, calendar_id, return_detailed_changes: bool = False):
     """Update calendar with new events using the calculated changes."""
     try:
@@ -1164,31 +1417,24 @@ def update_calendar(service, events, calendar_id, return_detailed_changes: bool
 
         logger.info(f"Applying changes: {len(events_to_insert)} to insert, {len(events_to_change)} to update, {len(events_to_delete)} to delete")
 
-        # Delete events
-        for event in events_to_delete:
-            try:
-                logger.debug(f"Deleting event: {event.get('summary', 'Unknown')}")
-                service.events().delete(calendarId=calendar_id, eventId=event['id']).execute()
-            except Exception as e:
-                logger.error(f"Error deleting event {event.get('id')}: {e}")
-
-        # Insert new events
-        for event in events_to_insert:
-            try:
-                logger.debug(f"Inserting event: {event.get('summary', 'Unknown')}")
-                service.events().insert(calendarId=calendar_id, body=event).execute()
-            except Exception as e:
-                logger.error(f"Error inserting event {event.get('summary', 'Unknown')}: {e}")
-
-        # Update changed events
-        for change in events_to_change:
-            try:
-                event_to_update = change['after']
-                event_id = change['before']['id']
-                logger.debug(f"Updating event: {event_to_update.get('summary', 'Unknown')}")
-                service.events().update(calendarId=calendar_id, eventId=event_id, body=event_to_update).execute()
-            except Exception as e:
-                logger.error(f"Error updating event {change['before'].get('id')}: {e}")
+        # Delete events, up to CALENDAR_BATCH_SIZE per HTTP request
+        execute_batched(service, [
+            (event.get('summary', 'Unknown'), service.events().delete(calendarId=calendar_id, eventId=event['id']))
+            for event in events_to_delete
+        ], 'deleting')
+
+        # Insert new events, up to CALENDAR_BATCH_SIZE per HTTP request
+        execute_batched(service, [
+            (event.get('summary', 'Unknown'), service.events().insert(calendarId=calendar_id, body=event))
+            for event in events_to_insert
+        ], 'inserting')
+
+        # Update changed events, up to CALENDAR_BATCH_SIZE per HTTP request
+        execute_batched(service, [
+            (change['after'].get('summary', 'Unknown'),
+             service.events().update(calendarId=calendar_id, eventId=change['before']['id'], body=change['after']))
+            for change in events_to_change
+        ], 'updating')
 
         logger.info("Calendar update completed successfully")
         
@@ -1197,9 +1443,8 @@ def update_calendar(service, events, calendar_id, return_detailed_changes: bool
         
         return len(events_to_delete), len(events_to_insert), len(events_to_change)
         
-    except Exception as e:
-        logger.error(f"Error in update_calendar: {e}")
-        logger.error(traceback.format_exc())
+    except Exception:
+        logger.exception("Error in update_calendar")
         raise
 
 if __name__ == '__main__':
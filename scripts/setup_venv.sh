@@ -46,7 +46,7 @@ pip install -r requirements.txt
 
 # Check installation
 echo "🔍 Verifying installation..."
-python -c "import dotenv, flask, google, pandas; print('✅ All dependencies installed successfully')"
+python -c "import dotenv, flask, google, matplotlib; print('✅ All dependencies installed successfully')"
 
 echo ""
 echo "✅ Virtual environment setup complete!"
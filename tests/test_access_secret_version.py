@@ -4,10 +4,14 @@ import os
 
 # Assuming access_secret_version is in automated_sync.py for testing purposes
 # In a real refactor, this would be in a shared utility file.
-from automated_sync import access_secret_version
+from automated_sync import access_secret_version, get_secret_client
 
 class TestAccessSecretVersion(unittest.TestCase):
 
+    def setUp(self):
+        # The client is shared across calls, so each test starts without one
+        get_secret_client.cache_clear()
+
     @mock.patch('automated_sync.secretmanager.SecretManagerServiceClient')
     def test_access_secret_version_is_secret_path(self, mock_client_class):
         """
@@ -52,5 +56,17 @@ class TestAccessSecretVersion(unittest.TestCase):
         mock_client_class.assert_called_once()
         mock_client_instance.access_secret_version.assert_called_once_with(name=secret_path)
 
+    @mock.patch('automated_sync.secretmanager.SecretManagerServiceClient')
+    def test_access_secret_version_reuses_client(self, mock_client_class):
+        """
+        Test that repeated secret lookups share one Secret Manager client.
+        """
+        mock_client_class.return_value.access_secret_version.return_value.payload.data = b"value"
+
+        access_secret_version("projects/123/secrets/spreadsheet-id/versions/latest")
+        access_secret_version("projects/123/secrets/to-email/versions/latest")
+
+        mock_client_class.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
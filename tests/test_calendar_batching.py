@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import MagicMock
+import httplib2
+from googleapiclient.errors import HttpError
+from calendar_sync import execute_batched, delete_all_events, CALENDAR_BATCH_SIZE
+
+class TestCalendarBatching(unittest.TestCase):
+
+    def test_requests_are_chunked_by_batch_size(self):
+        """Test that requests are split into batches of at most CALENDAR_BATCH_SIZE."""
+        service = MagicMock()
+        batches = []
+        service.new_batch_http_request.side_effect = lambda callback: batches.append(MagicMock()) or batches[-1]
+
+        requests = [(f"Event {i}", MagicMock()) for i in range(CALENDAR_BATCH_SIZE + 5)]
+        failures = execute_batched(service, requests, 'inserting')
+
+        self.assertEqual(failures, 0)
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[0].add.call_count, CALENDAR_BATCH_SIZE)
+        self.assertEqual(batches[1].add.call_count, 5)
+        for batch in batches:
+            batch.execute.assert_called_once()
+
+    def test_per_request_failures_are_counted(self):
+        """Test that exceptions reported to the batch callback are counted as failures."""
+        service = MagicMock()
+
+        def make_batch(callback):
+            batch = MagicMock()
+            batch.execute.side_effect = lambda: callback('1', None, Exception("API Error"))
+            return batch
+
+        service.new_batch_http_request.side_effect = make_batch
+
+        requests = [("Event A", MagicMock()), ("Event B", MagicMock())]
+        self.assertEqual(execute_batched(service, requests, 'inserting'), 1)
+
+    def test_failed_batch_falls_back_to_individual_requests(self):
+        """Test that a batch that is rejected outright is retried as individual requests."""
+        service = MagicMock()
+        service.new_batch_http_request.return_value.execute.side_effect = HttpError(httplib2.Response({'status': 503}), b'Batch unavailable')
+
+        failing_request = MagicMock()
+        failing_request.execute.side_effect = Exception("API Error")
+        requests = [("Event A", MagicMock()), ("Event B", failing_request)]
+
+        self.assertEqual(execute_batched(service, requests, 'inserting'), 1)
+        requests[0][1].execute.assert_called_once()
+        failing_request.execute.assert_called_once()
+
+    def test_partially_answered_batch_only_resends_pending_requests(self):
+        """Test that requests already answered by the batch are neither resent nor counted twice."""
+        service = MagicMock()
+
+        def make_batch(callback):
+            batch = MagicMock()
+
+            def execute():
+                callback('0', {}, None)
+                callback('1', None, Exception("API Error"))
+                raise HttpError(httplib2.Response({'status': 500}), b'Backend Error')
+
+            batch.execute.side_effect = execute
+            return batch
+
+        service.new_batch_http_request.side_effect = make_batch
+
+        requests = [("Event A", MagicMock()), ("Event B", MagicMock()), ("Event C", MagicMock())]
+        self.assertEqual(execute_batched(service, requests, 'inserting'), 1)
+        requests[0][1].execute.assert_not_called()
+        requests[1][1].execute.assert_not_called()
+        requests[2][1].execute.assert_called_once()
+
+    def test_transport_error_does_not_resend_requests(self):
+        """Test that a timeout is counted as failures without resending possibly applied requests."""
+        service = MagicMock()
+        service.new_batch_http_request.return_value.execute.side_effect = TimeoutError("timed out")
+
+        requests = [("Event A", MagicMock()), ("Event B", MagicMock())]
+        self.assertEqual(execute_batched(service, requests, 'inserting'), 2)
+        for _, request in requests:
+            request.execute.assert_not_called()
+
+    def test_delete_all_events_uses_batches(self):
+        """Test that delete_all_events sends its deletes through batch requests."""
+        service = MagicMock()
+        service.events.return_value.list.return_value.execute.return_value = {
+            'items': [{'id': str(i), 'summary': f"Event {i}"} for i in range(3)]
+        }
+
+        delete_all_events(service, 'calendar-id')
+
+        batch = service.new_batch_http_request.return_value
+        self.assertEqual(batch.add.call_count, 3)
+        batch.execute.assert_called_once()
+        service.events.return_value.delete.return_value.execute.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from datetime import date
-from calendar_sync import parse_date
+from unittest.mock import MagicMock
+from calendar_sync import (parse_date, _parse_date_for_year, grid_data_to_values, get_all_spreadsheet_data,
+                           get_event_match_key, create_or_get_sports_calendar, list_calendar_ids)
 
 class TestCalendarSync(unittest.TestCase):
 
@@ -22,10 +24,78 @@ class TestCalendarSync(unittest.TestCase):
         self.assertEqual(start_date, date(2024, 12, 28))
         self.assertEqual(end_date, date(2025, 1, 5))
 
+    def test_parse_date_range_year_only_on_end_crossing_new_year(self):
+        """Test that a range with only an end year starts in the previous year when it wraps."""
+        start_date, end_date = parse_date("12/28-1/5/2025")
+        self.assertEqual(start_date, date(2024, 12, 28))
+        self.assertEqual(end_date, date(2025, 1, 5))
+
     def test_parse_date_range_invalid_format(self):
         """Test that an invalid date range format raises a ValueError."""
         with self.assertRaises(ValueError):
             parse_date("1-2-2025")
 
+    def test_parse_date_range_end_before_start_is_invalid(self):
+        """Test that inverted, cross-year and loosely truncated ranges raise a ValueError."""
+        for date_str in ("8/28/2025 - 5/1999", "1/31/2025-7/2025", "9/5 - 6", "9/5-3"):
+            with self.subTest(date_str=date_str):
+                with self.assertRaises(ValueError):
+                    parse_date(date_str)
+
+    def test_parse_date_is_memoized(self):
+        """Test that repeated date strings are served from the parse cache."""
+        _parse_date_for_year.cache_clear()
+        first = parse_date("9/5/2025")
+        second = parse_date(" 9/5/2025 ")
+        self.assertEqual(first, second)
+        self.assertEqual(_parse_date_for_year.cache_info().hits, 1)
+
+    def test_grid_data_to_values_matches_values_get_shape(self):
+        """Test that grid data is trimmed like a values().get() response."""
+        sheet = {'data': [{'rowData': [
+            {'values': [{'formattedValue': 'Soccer'}]},
+            {},
+            {'values': [{'formattedValue': 'Date'}, {}, {'formattedValue': 'Event'}, {}]},
+            {'values': [{}, {}]},
+        ]}]}
+        self.assertEqual(grid_data_to_values(sheet), [['Soccer'], [], ['Date', '', 'Event']])
+
+    def test_get_all_spreadsheet_data_maps_value_ranges_to_sheets(self):
+        """Test that one batchGet call returns values keyed by sheet name."""
+        service = MagicMock()
+        batch_get = service.spreadsheets.return_value.values.return_value.batchGet
+        batch_get.return_value.execute.return_value = {'valueRanges': [
+            {'range': "Soccer!A1:I2", 'values': [['Soccer'], ['Date']]},
+            {'range': "Tennis!A1:I1000"},
+        ]}
+        self.assertEqual(
+            get_all_spreadsheet_data(service, 'sheet-id', ['Soccer', 'Tennis']),
+            {'Soccer': [['Soccer'], ['Date']], 'Tennis': []}
+        )
+        batch_get.assert_called_once()
+        self.assertEqual(batch_get.call_args.kwargs['ranges'], ['Soccer!A:I', 'Tennis!A:I'])
+
+    def test_get_event_match_key_ignores_timezone_representation(self):
+        """Test that the same instant in different offsets gives the same match key."""
+        utc_event = {'summary': 'Game ', 'start': {'dateTime': '2025-09-07T06:00:00Z'}}
+        local_event = {'summary': 'Game', 'start': {'dateTime': '2025-09-06T23:00:00-07:00'}}
+        self.assertEqual(get_event_match_key(utc_event), get_event_match_key(local_event))
+        self.assertNotEqual(get_event_match_key({'summary': 'Game', 'start': {'date': '2025-09-06'}}),
+                            get_event_match_key(local_event))
+
+    def test_calendar_ids_are_listed_once_for_many_sheets(self):
+        """Test that a prefetched calendar map is reused and extended with new calendars."""
+        service = MagicMock()
+        service.calendarList.return_value.list.return_value.execute.return_value = {
+            'items': [{'id': 'soccer-id', 'summary': 'SLOHS Soccer'}]
+        }
+        service.calendars.return_value.insert.return_value.execute.return_value = {'id': 'golf-id'}
+
+        calendar_ids = list_calendar_ids(service)
+        self.assertEqual(create_or_get_sports_calendar(service, 'SLOHS Soccer', calendar_ids=calendar_ids), 'soccer-id')
+        self.assertEqual(create_or_get_sports_calendar(service, 'SLOHS Golf', calendar_ids=calendar_ids), 'golf-id')
+        self.assertEqual(calendar_ids['SLOHS Golf'], 'golf-id')
+        service.calendarList.return_value.list.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
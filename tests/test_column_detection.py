@@ -1,49 +1,40 @@
 #!/usr/bin/env python3
 
-import logging
+import unittest
 from calendar_sync import parse_sports_events
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+HEADERS = ['Date', 'Day', 'Opponent', 'Location', 'Start Time', 'Bus/Vans', 'Release Time', 'Departure Time']
 
-def test_column_detection():
-    print("=== Testing Column Detection ===")
-    
-    # Test 1: With vans data
-    print("\nTest 1: With vans data")
-    test_data1 = [
+def make_sheet(transportation):
+    """Build a one-event Cross Country sheet with the given Bus/Vans cell."""
+    return [
         ['Cross Country'],
-        ['Date', 'Day', 'Opponent', 'Location', 'Start Time', 'Bus/Vans', 'Release Time', 'Departure Time'],
-        ['9/12/2025', 'Fri-Sat', 'Clovis North Hard Driven Tournament (V)', 'Clovis North', 'Fri- 2:00, Sat- 8:00 ', 'Vans ', '', '']
+        HEADERS,
+        ['9/12/2025', 'Fri-Sat', 'Clovis North Hard Driven Tournament (V)', 'Clovis North', 'Fri- 2:00, Sat- 8:00 ', transportation, '', '']
     ]
-    events1 = parse_sports_events(test_data1, 'Cross Country')
-    print(f"Events created: {len(events1)}")
-    if events1:
-        print(f"Description: {repr(events1[0]['description'])}")
-    
-    # Test 2: With empty vans data
-    print("\nTest 2: With empty vans data")
-    test_data2 = [
-        ['Cross Country'],
-        ['Date', 'Day', 'Opponent', 'Location', 'Start Time', 'Bus/Vans', 'Release Time', 'Departure Time'],
-        ['9/12/2025', 'Fri-Sat', 'Clovis North Hard Driven Tournament (V)', 'Clovis North', 'Fri- 2:00, Sat- 8:00 ', '- ', '', '']
-    ]
-    events2 = parse_sports_events(test_data2, 'Cross Country')
-    print(f"Events created: {len(events2)}")
-    if events2:
-        print(f"Description: {repr(events2[0]['description'])}")
-    
-    # Test 3: With vans data that has content
-    print("\nTest 3: With vans data that has content")
-    test_data3 = [
-        ['Cross Country'],
-        ['Date', 'Day', 'Opponent', 'Location', 'Start Time', 'Bus/Vans', 'Release Time', 'Departure Time'],
-        ['9/12/2025', 'Fri-Sat', 'Clovis North Hard Driven Tournament (V)', 'Clovis North', 'Fri- 2:00, Sat- 8:00 ', 'Vans (Need Drivers)', '', '']
-    ]
-    events3 = parse_sports_events(test_data3, 'Cross Country')
-    print(f"Events created: {len(events3)}")
-    if events3:
-        print(f"Description: {repr(events3[0]['description'])}")
 
-if __name__ == "__main__":
-    test_column_detection() 
\ No newline at end of file
+class TestColumnDetection(unittest.TestCase):
+
+    def test_vans_column_is_added_to_description(self):
+        """Test that a Bus/Vans value is reported as transportation."""
+        events = parse_sports_events(make_sheet('Vans '), 'Cross Country')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['description'],
+                         'Location: Clovis North\nTime: Fri- 2:00, Sat- 8:00 \nTransportation: Vans ')
+
+    def test_placeholder_transportation_and_empty_times(self):
+        """Test that a '- ' Bus/Vans placeholder is kept and empty Release/Departure cells are omitted."""
+        events = parse_sports_events(make_sheet('- '), 'Cross Country')
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['description'],
+                         'Location: Clovis North\nTime: Fri- 2:00, Sat- 8:00 \nTransportation: - ')
+
+    def test_vans_column_with_notes(self):
+        """Test that the full Bus/Vans text is kept."""
+        events = parse_sports_events(make_sheet('Vans (Need Drivers)'), 'Cross Country')
+        self.assertEqual(len(events), 1)
+        self.assertIn('Transportation: Vans (Need Drivers)', events[0]['description'])
+        self.assertEqual(events[0]['summary'], 'Clovis North Hard Driven Tournament (V) at Clovis North')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,22 +3,18 @@
 Test script to debug event comparison issues
 """
 
-import os
-import pickle
 from googleapiclient.discovery import build
-from calendar_sync import get_existing_events, get_event_key, events_are_equal
+from calendar_sync import get_existing_events, get_event_key, events_are_equal, load_token_credentials
 
 def test_event_comparison():
     """Test event comparison logic."""
     
     # Load credentials
-    if not os.path.exists('token.pickle'):
-        print("❌ No token.pickle found. Please authenticate first.")
+    creds = load_token_credentials()
+    if not creds:
+        print("❌ No token.json found. Please authenticate first.")
         return
     
-    with open('token.pickle', 'rb') as token:
-        creds = pickle.load(token)
-    
     # Build calendar service
     service = build('calendar', 'v3', credentials=creds)
     
@@ -0,0 +1,30 @@
+import unittest
+import os
+import subprocess
+import sys
+
+# Importing calendar_sync configures the root logger, so each case runs in its own interpreter
+CHECK_LEVEL = "import logging, calendar_sync; print(logging.getLogger().level)"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_with_log_level(log_level):
+    env = dict(os.environ, LOG_LEVEL=log_level)
+    return subprocess.run([sys.executable, '-c', CHECK_LEVEL], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+class TestLogLevel(unittest.TestCase):
+
+    def test_unknown_log_level_falls_back_to_debug(self):
+        """Test that an unknown LOG_LEVEL falls back to DEBUG with a warning instead of crashing."""
+        result = import_with_log_level('verbose')
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '10')
+        self.assertIn("WARNING - Unknown LOG_LEVEL 'VERBOSE', using DEBUG", result.stdout)
+
+    def test_known_log_level_is_used(self):
+        """Test that a valid LOG_LEVEL is applied to the root logger."""
+        result = import_with_log_level('info')
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '20')
+        self.assertNotIn('Unknown LOG_LEVEL', result.stdout)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import pickle
+import tempfile
+from google.oauth2.credentials import Credentials
+from calendar_sync import load_token_credentials, save_token_credentials, TOKEN_FILE, LEGACY_TOKEN_FILE
+
+def make_credentials():
+    return Credentials(
+        token='access-token',
+        refresh_token='refresh-token',
+        token_uri='https://oauth2.googleapis.com/token',
+        client_id='client-id',
+        client_secret='client-secret',
+        scopes=['https://www.googleapis.com/auth/calendar']
+    )
+
+class TestTokenCredentials(unittest.TestCase):
+
+    def setUp(self):
+        # Token files are resolved relative to the working directory
+        self.original_cwd = os.getcwd()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_json_round_trip(self):
+        """Test that saved credentials load back with the same values."""
+        save_token_credentials(make_credentials())
+
+        creds = load_token_credentials()
+
+        self.assertEqual(creds.token, 'access-token')
+        self.assertEqual(creds.refresh_token, 'refresh-token')
+        self.assertEqual(creds.client_id, 'client-id')
+        self.assertEqual(creds.client_secret, 'client-secret')
+        self.assertFalse(os.path.exists(f'{TOKEN_FILE}.tmp'))
+
+    def test_legacy_pickle_is_migrated(self):
+        """Test that a token.pickle is loaded and rewritten as token.json."""
+        with open(LEGACY_TOKEN_FILE, 'wb') as token:
+            pickle.dump(make_credentials(), token)
+
+        creds = load_token_credentials()
+
+        self.assertEqual(creds.refresh_token, 'refresh-token')
+        self.assertTrue(os.path.exists(TOKEN_FILE))
+        os.remove(LEGACY_TOKEN_FILE)
+        self.assertEqual(load_token_credentials().refresh_token, 'refresh-token')
+
+    def test_missing_token_file_returns_none(self):
+        """Test that no credentials are returned when no token file exists."""
+        self.assertIsNone(load_token_credentials())
+        self.assertFalse(os.path.exists(TOKEN_FILE))
+
+if __name__ == '__main__':
+    unittest.main()
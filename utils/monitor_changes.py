@@ -12,8 +12,6 @@ import sqlite3
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-import pandas as pd
 from pathlib import Path
 
 # Load environment variables
@@ -22,6 +20,44 @@ load_dotenv()
 # Define project root (assuming script is in utils/ or project root)
 PROJECT_ROOT = Path(__file__).resolve().parents[1] if Path(__file__).resolve().parent.name == 'utils' else Path(__file__).resolve().parent
 
+# Sync history schema, created in one executescript() call
+SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS sync_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    sheets_processed INTEGER,
+    events_created INTEGER,
+    events_updated INTEGER,
+    events_deleted INTEGER,
+    total_changes INTEGER,
+    success_rate REAL,
+    has_errors BOOLEAN,
+    error_count INTEGER,
+    sync_duration REAL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS sheet_details (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sync_id INTEGER,
+    sheet_name TEXT,
+    events_created INTEGER,
+    events_updated INTEGER,
+    events_deleted INTEGER,
+    total_events INTEGER,
+    success BOOLEAN,
+    error_message TEXT,
+    FOREIGN KEY (sync_id) REFERENCES sync_history (id)
+);
+
+-- Index the time-window filter and the sheet_details join
+CREATE INDEX IF NOT EXISTS idx_sync_history_timestamp ON sync_history (timestamp);
+CREATE INDEX IF NOT EXISTS idx_sheet_details_sync_id ON sheet_details (sync_id);
+'''
+
+# sync_history columns plotted by create_charts
+CHART_COLUMNS = ('timestamp', 'events_created', 'events_updated', 'events_deleted', 'success_rate')
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,57 +70,42 @@ class ChangeMonitor:
     
     def __init__(self, db_path=PROJECT_ROOT / 'sync_history.db'):
         self.db_path = db_path
+        # One connection for the monitor's lifetime instead of one per query
+        self.conn = self._connect()
+        self.conn.row_factory = sqlite3.Row
         self.init_database()
     
+    def close(self):
+        """Close the history database connection."""
+        self.conn.close()
+    
+    def _connect(self):
+        """Open a connection to the history database with per-connection tuning."""
+        # Autocommit mode; writes open their own transactions explicitly
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        # WAL (set in init_database) only needs NORMAL sync to stay consistent
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-8000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
     def init_database(self):
         """Initialize the SQLite database for storing sync history."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create sync_history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sync_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                sheets_processed INTEGER,
-                events_created INTEGER,
-                events_updated INTEGER,
-                events_deleted INTEGER,
-                total_changes INTEGER,
-                success_rate REAL,
-                has_errors BOOLEAN,
-                error_count INTEGER,
-                sync_duration REAL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create sheet_details table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sheet_details (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sync_id INTEGER,
-                sheet_name TEXT,
-                events_created INTEGER,
-                events_updated INTEGER,
-                events_deleted INTEGER,
-                total_events INTEGER,
-                success BOOLEAN,
-                error_message TEXT,
-                FOREIGN KEY (sync_id) REFERENCES sync_history (id)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        conn = self.conn
+        # The journal mode is stored in the database file, so set it once here
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA_SQL)
         logger.info(f"Database initialized: {self.db_path}")
     
     def record_sync_result(self, sync_results):
         """Record a sync result in the database."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.conn
         cursor = conn.cursor()
         
         try:
+            # Take the write lock up front rather than on the first INSERT
+            conn.execute('BEGIN IMMEDIATE')
+            
             # Insert main sync record
             cursor.execute('''
                 INSERT INTO sync_history (
@@ -107,61 +128,80 @@ class ChangeMonitor:
             
             sync_id = cursor.lastrowid
             
-            # Insert sheet details
-            for sheet_name, details in sync_results['sheet_details'].items():
-                cursor.execute('''
-                    INSERT INTO sheet_details (
-                        sync_id, sheet_name, events_created, events_updated,
-                        events_deleted, total_events, success, error_message
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    sync_id,
-                    sheet_name,
-                    details.get('events_created', 0),
-                    details.get('events_updated', 0),
-                    details.get('events_deleted', 0),
-                    details.get('total_events', 0),
-                    details.get('success', False),
-                    details.get('error', '')
-                ))
+            # Insert sheet details in one statement
+            cursor.executemany('''
+                INSERT INTO sheet_details (
+                    sync_id, sheet_name, events_created, events_updated,
+                    events_deleted, total_events, success, error_message
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(
+                sync_id,
+                sheet_name,
+                details.get('events_created', 0),
+                details.get('events_updated', 0),
+                details.get('events_deleted', 0),
+                details.get('total_events', 0),
+                details.get('success', False),
+                details.get('error', '')
+            ) for sheet_name, details in sync_results['sheet_details'].items()])
             
-            conn.commit()
+            conn.execute('COMMIT')
             logger.info(f"Recorded sync result with ID: {sync_id}")
             return sync_id
             
         except Exception as e:
             logger.error(f"Error recording sync result: {e}")
-            conn.rollback()
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
             return None
-        finally:
-            conn.close()
     
-    def get_recent_syncs(self, hours=24):
-        """Get sync results from the last N hours."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_recent_syncs(self, hours=24, limit=None, columns=None):
+        """Get sync results from the last N hours, newest first.
+
+        `limit` caps the number of rows and `columns` narrows them to the
+        given sync_history column names; by default every column is returned.
+        """
+        cursor = self.conn.cursor()
         
         cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+        selected = ', '.join(columns) if columns else '*'
         
-        cursor.execute('''
-            SELECT * FROM sync_history 
+        # SQLite treats a negative LIMIT as no limit
+        cursor.execute(f'''
+            SELECT {selected} FROM sync_history 
             WHERE timestamp > ? 
             ORDER BY timestamp DESC
-        ''', (cutoff_time,))
+            LIMIT ?
+        ''', (cutoff_time, limit if limit is not None else -1))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_sync_totals(self, hours=24):
+        """Get sync counts, change totals and the average sync interval for the last N hours."""
+        cursor = self.conn.cursor()
         
-        columns = [description[0] for description in cursor.description]
-        results = []
+        cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
         
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
+        cursor.execute('''
+            SELECT 
+                COUNT(*) as total_syncs,
+                SUM(events_created) as total_created,
+                SUM(events_updated) as total_updated,
+                SUM(events_deleted) as total_deleted,
+                SUM(total_changes) as total_changes,
+                AVG(success_rate) as avg_success_rate,
+                -- The mean of consecutive gaps telescopes to (last - first) / (n - 1)
+                (julianday(MAX(timestamp)) - julianday(MIN(timestamp))) * 24
+                    / NULLIF(COUNT(*) - 1, 0) as avg_interval_hours
+            FROM sync_history
+            WHERE timestamp > ?
+        ''', (cutoff_time,))
         
-        conn.close()
-        return results
+        return dict(cursor.fetchone())
     
     def get_sheet_statistics(self, days=7):
         """Get statistics for each sheet over the last N days."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         cutoff_time = (datetime.now() - timedelta(days=days)).isoformat()
         
@@ -181,92 +221,81 @@ class ChangeMonitor:
             ORDER BY total_created DESC
         ''', (cutoff_time,))
         
-        columns = [description[0] for description in cursor.description]
-        results = []
-        
-        for row in cursor.fetchall():
-            results.append(dict(zip(columns, row)))
-        
-        conn.close()
-        return results
+        return [dict(row) for row in cursor.fetchall()]
     
     def generate_change_report(self, days=7):
         """Generate a comprehensive change report."""
-        recent_syncs = self.get_recent_syncs(hours=days*24)
-        sheet_stats = self.get_sheet_statistics(days)
+        # Totals are aggregated in SQLite; only the last 10 rows are fetched
+        totals = self.get_sync_totals(hours=days*24)
         
-        if not recent_syncs:
+        if not totals['total_syncs']:
             return {
                 'message': f'No sync data found for the last {days} days',
                 'period': f'{days} days',
                 'total_syncs': 0
             }
         
-        # Calculate overall statistics
-        total_syncs = len(recent_syncs)
-        total_created = sum(s['events_created'] for s in recent_syncs)
-        total_updated = sum(s['events_updated'] for s in recent_syncs)
-        total_deleted = sum(s['events_deleted'] for s in recent_syncs)
-        total_changes = sum(s['total_changes'] for s in recent_syncs)
-        avg_success_rate = sum(s['success_rate'] for s in recent_syncs) / total_syncs
+        sheet_stats = self.get_sheet_statistics(days)
         
         # Find most active sheets
         active_sheets = sorted(sheet_stats, key=lambda x: x['total_created'], reverse=True)[:5]
         
-        # Calculate sync frequency
-        if len(recent_syncs) > 1:
-            sync_times = [datetime.fromisoformat(s['timestamp']) for s in recent_syncs]
-            sync_times.sort()
-            avg_interval = sum((sync_times[i+1] - sync_times[i]).total_seconds() 
-                             for i in range(len(sync_times)-1)) / (len(sync_times)-1) / 3600  # hours
-        else:
-            avg_interval = None
+        avg_interval = totals['avg_interval_hours']
         
         return {
             'period': f'{days} days',
-            'total_syncs': total_syncs,
-            'total_created': total_created,
-            'total_updated': total_updated,
-            'total_deleted': total_deleted,
-            'total_changes': total_changes,
-            'avg_success_rate': round(avg_success_rate, 1),
+            'total_syncs': totals['total_syncs'],
+            'total_created': totals['total_created'],
+            'total_updated': totals['total_updated'],
+            'total_deleted': totals['total_deleted'],
+            'total_changes': totals['total_changes'],
+            'avg_success_rate': round(totals['avg_success_rate'], 1),
             'avg_sync_interval_hours': round(avg_interval, 1) if avg_interval else None,
             'most_active_sheets': active_sheets,
-            'recent_syncs': recent_syncs[:10],  # Last 10 syncs
+            'recent_syncs': self.get_recent_syncs(hours=days*24, limit=10),  # Last 10 syncs
             'sheet_statistics': sheet_stats
         }
     
     def create_charts(self, days=7, output_dir=PROJECT_ROOT / 'charts'):
         """Create visual charts of sync activity."""
+        # matplotlib is only needed here, so runs that only record and report skip importing it.
+        # Agg renders straight to PNG without probing for a GUI backend.
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
         Path(output_dir).mkdir(exist_ok=True)
         
         # Get data
-        recent_syncs = self.get_recent_syncs(hours=days*24)
+        recent_syncs = self.get_recent_syncs(hours=days*24, columns=CHART_COLUMNS)
         sheet_stats = self.get_sheet_statistics(days)
         
         if not recent_syncs:
             logger.warning("No data available for charts")
             return
         
-        # Convert to DataFrame for easier plotting
-        df = pd.DataFrame(recent_syncs)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        # Plain columns are all matplotlib needs, so skip building a DataFrame
+        timestamps = [datetime.fromisoformat(s['timestamp']) for s in recent_syncs]
+        created = [s['events_created'] for s in recent_syncs]
+        updated = [s['events_updated'] for s in recent_syncs]
+        deleted = [s['events_deleted'] for s in recent_syncs]
+        success_rates = [s['success_rate'] for s in recent_syncs]
         
         # Create charts
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle(f'Calendar Sync Activity - Last {days} Days', fontsize=16)
         
         # Chart 1: Changes over time
-        axes[0, 0].plot(df['timestamp'], df['events_created'], label='Created', marker='o')
-        axes[0, 0].plot(df['timestamp'], df['events_updated'], label='Updated', marker='s')
-        axes[0, 0].plot(df['timestamp'], df['events_deleted'], label='Deleted', marker='^')
+        axes[0, 0].plot(timestamps, created, label='Created', marker='o')
+        axes[0, 0].plot(timestamps, updated, label='Updated', marker='s')
+        axes[0, 0].plot(timestamps, deleted, label='Deleted', marker='^')
         axes[0, 0].set_title('Changes Over Time')
         axes[0, 0].set_ylabel('Number of Events')
         axes[0, 0].legend()
         axes[0, 0].tick_params(axis='x', rotation=45)
         
         # Chart 2: Success rate over time
-        axes[0, 1].plot(df['timestamp'], df['success_rate'], marker='o', color='green')
+        axes[0, 1].plot(timestamps, success_rates, marker='o', color='green')
         axes[0, 1].set_title('Success Rate Over Time')
         axes[0, 1].set_ylabel('Success Rate (%)')
         axes[0, 1].tick_params(axis='x', rotation=45)
@@ -281,17 +310,20 @@ class ChangeMonitor:
             axes[1, 0].set_xlabel('Total Events Created')
         
         # Chart 4: Sync frequency
-        if len(df) > 1:
-            intervals = df['timestamp'].diff().dt.total_seconds() / 3600  # hours
-            axes[1, 1].hist(intervals.dropna(), bins=10, alpha=0.7)
+        if len(timestamps) > 1:
+            # Rows are newest first, so each gap is the newer minus the older sync
+            intervals = [(newer - older).total_seconds() / 3600  # hours
+                         for newer, older in zip(timestamps, timestamps[1:])]
+            axes[1, 1].hist(intervals, bins=10, alpha=0.7)
             axes[1, 1].set_title('Sync Intervals Distribution')
             axes[1, 1].set_xlabel('Hours Between Syncs')
             axes[1, 1].set_ylabel('Frequency')
         
-        plt.tight_layout()
+        fig.tight_layout()
         chart_path = os.path.join(output_dir, f'sync_charts_{datetime.now().strftime("%Y%m%d")}.png')
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        # 150 dpi is sharp on screen and a quarter of the pixels of 300 dpi
+        fig.savefig(chart_path, dpi=150, bbox_inches='tight')
+        plt.close(fig)
         
         logger.info(f"Charts saved to: {chart_path}")
         return chart_path
@@ -336,14 +368,16 @@ def main():
         for sheet in report['most_active_sheets'][:5]:
             print(f"  - {sheet['sheet_name']}: {sheet['total_created']} events created")
     
-    # Create charts
-    try:
-        chart_path = monitor.create_charts(days=7)
-        print(f"\nCharts saved to: {chart_path}")
-    except Exception as e:
-        logger.error(f"Error creating charts: {e}")
+    # Create charts only when asked, since rendering them is most of the run time
+    if os.getenv('MONITOR_CHARTS', 'false').lower() == 'true':
+        try:
+            chart_path = monitor.create_charts(days=7)
+            print(f"\nCharts saved to: {chart_path}")
+        except Exception as e:
+            logger.error(f"Error creating charts: {e}")
     
     print("="*50)
+    monitor.close()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file